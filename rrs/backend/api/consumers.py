@@ -1,27 +1,387 @@
 import json
 import asyncio
+import random
+from bisect import bisect_right
+from collections import defaultdict
+from functools import partial
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.core.cache import cache
 from django.utils import timezone
 from .models import Room, Reservation
 
-class RoomConsumer(AsyncJsonWebsocketConsumer):
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
+
+# Short-TTL caches so N clients of the same room share one status query
+# per interval instead of each paying the full cost on every heartbeat.
+ROOM_STATUS_CACHE_TIMEOUT = 5  # seconds
+OVERVIEW_STATUS_CACHE_TIMEOUT = 10  # seconds
+OVERVIEW_STATUS_CACHE_KEY = 'rooms_overview_status'
+
+
+def room_status_cache_key(room_id):
+    return f'room_status:{room_id}'
+
+
+def _minute_of_day(t):
+    """Minutes since midnight for a time object — avoids building and
+    subtracting full datetimes just to get a minute delta."""
+    return t.hour * 60 + t.minute
+
+
+def invalidate_room_status_cache(room_id):
+    """
+    Drop the cached status for a room (and the overview snapshot) so the
+    next heartbeat recomputes it. Called from the reservation signal
+    handlers whenever a reservation changes.
+    """
+    cache.delete(room_status_cache_key(room_id))
+    cache.delete(OVERVIEW_STATUS_CACHE_KEY)
+
+
+def get_room_status(room_id):
+    """
+    Get current room occupancy status from database.
+    Returns occupancy info, reservations today, next available slot.
+    Results are cached for a few seconds so concurrent heartbeats
+    for the same room share a single query.
+    """
+    cached = cache.get(room_status_cache_key(room_id))
+    if cached is not None:
+        return cached
+
+    # Room existence is validated once at connect(), so the hot path
+    # only queries reservations.
+    now = timezone.now()
+    today = now.date()
+    current_time = now.time()
+
+    # Get today's reservations, materialized once so the count below
+    # is a len() instead of a second SELECT COUNT(*)
+    today_reservations = list(Reservation.objects.filter(
+        room_id=room_id,
+        date=today,
+        status__in=['pending', 'confirmed']
+    ).only('start_time', 'end_time', 'attendees').order_by('start_time'))
+
+    # Reservations are sorted by start_time, so the current and next
+    # reservation can be located with a binary search instead of
+    # scanning the whole list twice.
+    starts = [res.start_time for res in today_reservations]
+    idx = bisect_right(starts, current_time)
+
+    is_occupied = False
+    current_reservation = None
+    if idx > 0 and today_reservations[idx - 1].end_time >= current_time:
+        is_occupied = True
+        current_reservation = today_reservations[idx - 1]
+
+    next_reservation = today_reservations[idx] if idx < len(starts) else None
+
+    # Calculate next available time
+    next_available = None
+    if is_occupied and current_reservation:
+        next_available = current_reservation.end_time.strftime('%H:%M')
+    elif next_reservation:
+        next_available = next_reservation.start_time.strftime('%H:%M')
+
+    # Occupancy status
+    occupancy_status = 'free'
+    time_until_free = None
+    if is_occupied:
+        minutes_diff = _minute_of_day(current_reservation.end_time) - _minute_of_day(current_time)
+
+        if minutes_diff <= 15:
+            occupancy_status = 'ending_soon'
+            time_until_free = minutes_diff
+        else:
+            occupancy_status = 'occupied'
+            time_until_free = minutes_diff
+
+    status = {
+        'room_id': room_id,
+        'is_occupied': is_occupied,
+        'occupancy_status': occupancy_status,
+        'time_until_free': time_until_free,
+        'reservations_today': len(today_reservations),
+        'next_available': next_available,
+        'current_attendees': current_reservation.attendees if current_reservation else 0,
+    }
+    cache.set(room_status_cache_key(room_id), status, ROOM_STATUS_CACHE_TIMEOUT)
+    return status
+
+
+def get_all_rooms_status():
+    """
+    Get current occupancy status for all active rooms.
+    The full snapshot is cached briefly so concurrent overview
+    clients share a single round of queries.
+    """
+    cached = cache.get(OVERVIEW_STATUS_CACHE_KEY)
+    if cached is not None:
+        return cached
+
+    rooms = Room.objects.filter(is_active=True).only(
+        'id', 'name', 'building', 'floor', 'capacity'
+    )
+    now = timezone.now()
+    today = now.date()
+    current_time = now.time()
+    # Converted once here instead of per room inside the loop
+    current_min = _minute_of_day(current_time)
+
+    # Fetch today's reservations for all rooms in one query and group
+    # them in memory, instead of one query per room (N+1).
+    reservations_by_room = defaultdict(list)
+    all_reservations = Reservation.objects.filter(
+        room__in=rooms,
+        date=today,
+        status__in=['pending', 'confirmed']
+    ).only('room_id', 'start_time', 'end_time', 'attendees').order_by('room_id', 'start_time')
+    for res in all_reservations:
+        reservations_by_room[res.room_id].append(res)
+
+    room_statuses = []
+    for room in rooms:
+        today_reservations = reservations_by_room[room.id]
+
+        # Binary search on the sorted start times for current/next
+        # reservation instead of two linear scans.
+        starts = [res.start_time for res in today_reservations]
+        idx = bisect_right(starts, current_time)
+
+        is_occupied = False
+        current_reservation = None
+        if idx > 0 and today_reservations[idx - 1].end_time >= current_time:
+            is_occupied = True
+            current_reservation = today_reservations[idx - 1]
+
+        next_reservation = today_reservations[idx] if idx < len(starts) else None
+
+        # Calculate next available time
+        next_available = None
+        if is_occupied and current_reservation:
+            next_available = current_reservation.end_time.strftime('%H:%M')
+        elif next_reservation:
+            next_available = next_reservation.start_time.strftime('%H:%M')
+
+        # Occupancy status
+        occupancy_status = 'free'
+        time_until_free = None
+        if is_occupied:
+            minutes_diff = _minute_of_day(current_reservation.end_time) - current_min
+
+            if minutes_diff <= 15:
+                occupancy_status = 'ending_soon'
+                time_until_free = minutes_diff
+            else:
+                occupancy_status = 'occupied'
+                time_until_free = minutes_diff
+
+        room_statuses.append({
+            'room_id': room.id,
+            'room_name': room.name,
+            'building': room.building,
+            'floor': room.floor,
+            'capacity': room.capacity,
+            'is_occupied': is_occupied,
+            'occupancy_status': occupancy_status,
+            'time_until_free': time_until_free,
+            'reservations_today': len(today_reservations),
+            'next_available': next_available,
+            'current_attendees': current_reservation.attendees if current_reservation else 0,
+        })
+
+    cache.set(OVERVIEW_STATUS_CACHE_KEY, room_statuses, OVERVIEW_STATUS_CACHE_TIMEOUT)
+    return room_statuses
+
+
+class GroupHeartbeat:
+    """
+    Runs one heartbeat loop per channel group per process, shared by all
+    local consumers in that group. Heartbeat DB work and serialization
+    then scale with the number of rooms instead of the number of
+    connected clients.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self._refcounts = {}
+
+    def subscribe(self, group_name, interval, tick):
+        """Count a subscriber in; start the loop on the first one."""
+        self._refcounts[group_name] = self._refcounts.get(group_name, 0) + 1
+        if group_name not in self._tasks:
+            self._tasks[group_name] = asyncio.create_task(
+                self._run(interval, tick)
+            )
+
+    def unsubscribe(self, group_name):
+        """Count a subscriber out; cancel the loop when none remain."""
+        remaining = self._refcounts.get(group_name, 1) - 1
+        if remaining > 0:
+            self._refcounts[group_name] = remaining
+            return
+        self._refcounts.pop(group_name, None)
+        task = self._tasks.pop(group_name, None)
+        if task:
+            task.cancel()
+
+    async def _run(self, interval, tick):
+        # +/-10% jitter keeps loops started at the same moment (e.g. a
+        # reconnect storm) from ticking the database in lockstep.
+        jitter = interval * 0.1
+        try:
+            while True:
+                await asyncio.sleep(interval + random.uniform(-jitter, jitter))
+                await tick()
+        except asyncio.CancelledError:
+            pass
+
+
+group_heartbeats = GroupHeartbeat()
+
+
+async def broadcast_room_heartbeat(room_id, group_name):
+    """
+    Shared heartbeat tick for a room group: one status query and one
+    group_send per tick, with the payload encoded once for all
+    subscribers.
+    """
+    status = await database_sync_to_async(get_room_status)(room_id)
+    if not status:
+        return
+    payload_json = json.dumps({
+        'type': 'heartbeat',
+        'status': status,
+        'timestamp': timezone.now().isoformat()
+    })
+    await get_channel_layer().group_send(group_name, {
+        'type': 'heartbeat_broadcast',
+        'payload_json': payload_json,
+    })
+
+
+async def broadcast_overview_heartbeat():
+    """
+    Shared heartbeat tick for the overview group. The snapshot is sent in
+    the channel event; each consumer diffs it against its own last-sent
+    state before forwarding.
+    """
+    all_statuses = await database_sync_to_async(get_all_rooms_status)()
+    await get_channel_layer().group_send('rooms_overview', {
+        'type': 'heartbeat_broadcast',
+        'rooms': all_statuses,
+    })
+
+
+class FastJSONMixin:
+    """
+    Encode/decode WebSocket JSON frames with orjson when it is installed.
+    orjson is several times faster than the stdlib encoder for the nested
+    status dicts these consumers fan out; stdlib json is the fallback.
+    """
+
+    @classmethod
+    async def encode_json(cls, content):
+        if orjson is not None:
+            return orjson.dumps(content).decode()
+        return json.dumps(content)
+
+    @classmethod
+    async def decode_json(cls, text_data):
+        if orjson is not None:
+            return orjson.loads(text_data)
+        return json.loads(text_data)
+
+
+class EventBatchMixin:
+    """
+    Buffers outbound reservation events per connection and flushes them
+    shortly afterwards, so a burst of changes (e.g. a recurring-pattern
+    creation) becomes a single WebSocket frame instead of one per event.
+    """
+
+    FLUSH_DELAY = 0.05  # seconds to wait for more events before flushing
+    MAX_PENDING_EVENTS = 128  # hard cap that triggers an immediate flush
+
+    async def queue_event(self, message):
+        """
+        Buffer an outbound message and schedule a coalesced flush.
+        ``message`` may be a dict or an already-encoded JSON string (the
+        broadcast path pre-encodes payloads once per group send).
+        """
+        self._pending_events.append(message)
+        if len(self._pending_events) >= self.MAX_PENDING_EVENTS:
+            self._cancel_flush()
+            await self.flush_events()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after(self.FLUSH_DELAY))
+
+    async def flush_events(self):
+        """Send all buffered events, batched into one frame if several."""
+        if not self._pending_events:
+            return
+        events, self._pending_events = self._pending_events, []
+        if len(events) == 1:
+            await self._send_event(events[0])
+        else:
+            # Pre-encoded payloads are spliced in verbatim so nothing gets
+            # serialized twice.
+            parts = [e if isinstance(e, str) else json.dumps(e) for e in events]
+            await self.send(text_data='{"type": "batch", "events": [%s]}' % ', '.join(parts))
+
+    async def _send_event(self, event):
+        if isinstance(event, str):
+            await self.send(text_data=event)
+        else:
+            await self.send_json(event)
+
+    async def _flush_after(self, delay):
+        try:
+            await asyncio.sleep(delay)
+            await self.flush_events()
+        except asyncio.CancelledError:
+            pass
+
+    def _cancel_flush(self):
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+
+class RoomConsumer(FastJSONMixin, EventBatchMixin, AsyncJsonWebsocketConsumer):
     """
     WebSocket consumer for real-time room reservation updates.
 
     Clients connect to a specific room channel and receive real-time notifications
     when reservations are created, confirmed, cancelled, or deleted for that room.
-    Includes periodic heartbeat messages with current room occupancy status.
+    Heartbeats with current occupancy come from a shared per-room broadcaster
+    rather than a task per connection.
     """
 
     async def connect(self):
         """
         Handle WebSocket connection.
-        Adds the client to the room-specific channel group and starts heartbeat.
+        Adds the client to the room-specific channel group and subscribes
+        to the shared per-room heartbeat broadcaster.
         """
-        self.room_id = self.scope['url_route']['kwargs']['room_id']
+        self.room_id = int(self.scope['url_route']['kwargs']['room_id'])
         self.group_name = f'room_{self.room_id}'
-        self.heartbeat_task = None
+        self._pending_events = []
+        self._flush_task = None
+
+        # Validate the room once here instead of on every status tick
+        room_exists = await database_sync_to_async(
+            Room.objects.filter(pk=self.room_id, is_active=True).exists
+        )()
+        if not room_exists:
+            await self.close(code=4004)
+            return
 
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
@@ -34,119 +394,43 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
                 'status': status
             })
 
-        # Start heartbeat task (every 30 seconds)
-        self.heartbeat_task = asyncio.create_task(self.send_heartbeat())
+        # Join the shared heartbeat (one 30 s loop per room, not per client)
+        group_heartbeats.subscribe(
+            self.group_name, 30,
+            partial(broadcast_room_heartbeat, self.room_id, self.group_name)
+        )
+        self._heartbeat_subscribed = True
 
     async def disconnect(self, close_code):
         """
         Handle WebSocket disconnection.
-        Removes the client from the room-specific channel group and stops heartbeat.
+        Removes the client from the room-specific channel group and drops
+        its shared-heartbeat subscription. Connections rejected before
+        accept never subscribed, so only unsubscribe if we did.
         """
-        # Cancel heartbeat task
-        if self.heartbeat_task:
-            self.heartbeat_task.cancel()
-            try:
-                await self.heartbeat_task
-            except asyncio.CancelledError:
-                pass
-
+        if getattr(self, '_heartbeat_subscribed', False):
+            group_heartbeats.unsubscribe(self.group_name)
+        self._cancel_flush()
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
-    async def send_heartbeat(self):
-        """
-        Periodically send heartbeat messages with current room status.
-        Runs every 30 seconds.
-        """
-        try:
-            while True:
-                await asyncio.sleep(30)
-                status = await self.get_room_status()
-                if status:
-                    await self.send_json({
-                        'type': 'heartbeat',
-                        'status': status,
-                        'timestamp': timezone.now().isoformat()
-                    })
-        except asyncio.CancelledError:
-            pass
-
     @database_sync_to_async
     def get_room_status(self):
+        return get_room_status(self.room_id)
+
+    async def heartbeat_broadcast(self, event):
         """
-        Get current room occupancy status from database.
-        Returns occupancy info, reservations today, next available slot.
+        Forward the shared heartbeat payload (already JSON-encoded once by
+        the broadcaster) to this client.
         """
-        try:
-            room = Room.objects.get(pk=self.room_id, is_active=True)
-            now = timezone.now()
-            today = now.date()
-            current_time = now.time()
-
-            # Get today's reservations
-            today_reservations = Reservation.objects.filter(
-                room=room,
-                date=today,
-                status__in=['pending', 'confirmed']
-            ).order_by('start_time')
-
-            # Calculate current occupancy
-            is_occupied = False
-            current_reservation = None
-            for res in today_reservations:
-                if res.start_time <= current_time <= res.end_time:
-                    is_occupied = True
-                    current_reservation = res
-                    break
-
-            # Find next reservation
-            next_reservation = None
-            for res in today_reservations:
-                if res.start_time > current_time:
-                    next_reservation = res
-                    break
-
-            # Calculate next available time
-            next_available = None
-            if is_occupied and current_reservation:
-                next_available = current_reservation.end_time.strftime('%H:%M')
-            elif next_reservation:
-                next_available = next_reservation.start_time.strftime('%H:%M')
-
-            # Occupancy status
-            occupancy_status = 'free'
-            time_until_free = None
-            if is_occupied:
-                end_datetime = timezone.datetime.combine(today, current_reservation.end_time)
-                now_datetime = timezone.datetime.combine(today, current_time)
-                minutes_diff = (end_datetime - now_datetime).total_seconds() / 60
-
-                if minutes_diff <= 15:
-                    occupancy_status = 'ending_soon'
-                    time_until_free = int(minutes_diff)
-                else:
-                    occupancy_status = 'occupied'
-                    time_until_free = int(minutes_diff)
-
-            return {
-                'room_id': room.id,
-                'is_occupied': is_occupied,
-                'occupancy_status': occupancy_status,
-                'time_until_free': time_until_free,
-                'reservations_today': today_reservations.count(),
-                'next_available': next_available,
-                'current_attendees': current_reservation.attendees if current_reservation else 0,
-            }
-        except Room.DoesNotExist:
-            return None
+        await self.send(text_data=event['payload_json'])
 
     async def reservation_created(self, event):
         """
         Handle reservation creation events.
         Sends notification to WebSocket client when a new reservation is created.
         """
-        await self.send_json({
+        await self.queue_event(event.get('payload_json') or {
             'type': 'reservation.created',
-            'reservation': event.get('reservation'),
             'reservation_id': event.get('reservation_id'),
             'room_id': event.get('room_id'),
             'event_type': event.get('event_type'),
@@ -157,9 +441,8 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
         Handle reservation cancellation events.
         Sends notification to WebSocket client when a reservation is cancelled.
         """
-        await self.send_json({
+        await self.queue_event(event.get('payload_json') or {
             'type': 'reservation.cancelled',
-            'reservation': event.get('reservation'),
             'reservation_id': event.get('reservation_id'),
             'room_id': event.get('room_id'),
             'event_type': event.get('event_type'),
@@ -170,9 +453,8 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
         Handle reservation confirmation events.
         Sends notification to WebSocket client when a reservation is confirmed.
         """
-        await self.send_json({
+        await self.queue_event(event.get('payload_json') or {
             'type': 'reservation.confirmed',
-            'reservation': event.get('reservation'),
             'reservation_id': event.get('reservation_id'),
             'room_id': event.get('room_id'),
             'event_type': event.get('event_type'),
@@ -183,7 +465,7 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
         Handle reservation deletion events.
         Sends notification to WebSocket client when a reservation is deleted.
         """
-        await self.send_json({
+        await self.queue_event(event.get('payload_json') or {
             'type': 'reservation.deleted',
             'reservation_id': event.get('reservation_id'),
             'room_id': event.get('room_id'),
@@ -191,7 +473,7 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
         })
 
 
-class RoomsOverviewConsumer(AsyncJsonWebsocketConsumer):
+class RoomsOverviewConsumer(FastJSONMixin, EventBatchMixin, AsyncJsonWebsocketConsumer):
     """
     WebSocket consumer for monitoring all rooms at once.
     Provides a live overview of all room statuses and broadcasts updates
@@ -201,136 +483,116 @@ class RoomsOverviewConsumer(AsyncJsonWebsocketConsumer):
     async def connect(self):
         """
         Handle WebSocket connection.
-        Adds the client to the global rooms overview group.
+        Adds the client to the global rooms overview group and subscribes
+        to the shared overview heartbeat broadcaster.
         """
         self.group_name = 'rooms_overview'
-        self.heartbeat_task = None
+        self._pending_events = []
+        self._flush_task = None
+        # room_id -> hash of the last status dict sent to this client,
+        # used to send heartbeat deltas instead of full snapshots
+        self._last_hashes = {}
 
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
 
         # Send initial status of all rooms
         all_statuses = await self.get_all_rooms_status()
+        self._last_hashes = {
+            room_status['room_id']: self._status_hash(room_status)
+            for room_status in all_statuses
+        }
         await self.send_json({
             'type': 'rooms.status',
             'rooms': all_statuses
         })
 
-        # Start heartbeat task (every 60 seconds for overview)
-        self.heartbeat_task = asyncio.create_task(self.send_heartbeat())
+        # Join the shared heartbeat. Updates are pushed on change via
+        # room_update, so the heartbeat is only a 5-minute keepalive.
+        group_heartbeats.subscribe(self.group_name, 300, broadcast_overview_heartbeat)
+        self._heartbeat_subscribed = True
 
     async def disconnect(self, close_code):
         """
         Handle WebSocket disconnection.
-        Removes the client from the overview group and stops heartbeat.
+        Removes the client from the overview group and drops its
+        shared-heartbeat subscription.
         """
-        if self.heartbeat_task:
-            self.heartbeat_task.cancel()
-            try:
-                await self.heartbeat_task
-            except asyncio.CancelledError:
-                pass
-
+        if getattr(self, '_heartbeat_subscribed', False):
+            group_heartbeats.unsubscribe(self.group_name)
+        self._cancel_flush()
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
-    async def send_heartbeat(self):
+    @staticmethod
+    def _status_hash(status):
+        """Cheap fingerprint of a room status dict for change detection."""
+        return hash(tuple(sorted(status.items())))
+
+    async def heartbeat_broadcast(self, event):
         """
-        Periodically send heartbeat messages with all rooms status.
-        Runs every 60 seconds.
+        Diff the shared heartbeat snapshot against the last state sent to
+        this client and forward only the rooms that changed. Steady-state
+        heartbeats shrink to a near-empty delta instead of a full snapshot.
         """
-        try:
-            while True:
-                await asyncio.sleep(60)
-                all_statuses = await self.get_all_rooms_status()
-                await self.send_json({
-                    'type': 'heartbeat',
-                    'rooms': all_statuses,
-                    'timestamp': timezone.now().isoformat()
-                })
-        except asyncio.CancelledError:
-            pass
+        all_statuses = event['rooms']
+
+        changed = []
+        current_hashes = {}
+        for room_status in all_statuses:
+            status_hash = self._status_hash(room_status)
+            current_hashes[room_status['room_id']] = status_hash
+            if status_hash != self._last_hashes.get(room_status['room_id']):
+                changed.append(room_status)
+        removed = [
+            room_id for room_id in self._last_hashes
+            if room_id not in current_hashes
+        ]
+        self._last_hashes = current_hashes
+
+        await self.send_json({
+            'type': 'heartbeat.delta',
+            'changed': changed,
+            'removed': removed,
+            'timestamp': timezone.now().isoformat()
+        })
 
     @database_sync_to_async
     def get_all_rooms_status(self):
+        return get_all_rooms_status()
+
+    async def receive_json(self, content):
         """
-        Get current occupancy status for all active rooms.
+        Handle client commands. A {'type': 'refresh'} message re-sends the
+        full snapshot for clients that want to resync explicitly.
         """
-        rooms = Room.objects.filter(is_active=True)
-        now = timezone.now()
-        today = now.date()
-        current_time = now.time()
-
-        room_statuses = []
-        for room in rooms:
-            # Get today's reservations
-            today_reservations = Reservation.objects.filter(
-                room=room,
-                date=today,
-                status__in=['pending', 'confirmed']
-            ).order_by('start_time')
-
-            # Calculate current occupancy
-            is_occupied = False
-            current_reservation = None
-            for res in today_reservations:
-                if res.start_time <= current_time <= res.end_time:
-                    is_occupied = True
-                    current_reservation = res
-                    break
-
-            # Find next reservation
-            next_reservation = None
-            for res in today_reservations:
-                if res.start_time > current_time:
-                    next_reservation = res
-                    break
-
-            # Calculate next available time
-            next_available = None
-            if is_occupied and current_reservation:
-                next_available = current_reservation.end_time.strftime('%H:%M')
-            elif next_reservation:
-                next_available = next_reservation.start_time.strftime('%H:%M')
-
-            # Occupancy status
-            occupancy_status = 'free'
-            time_until_free = None
-            if is_occupied:
-                end_datetime = timezone.datetime.combine(today, current_reservation.end_time)
-                now_datetime = timezone.datetime.combine(today, current_time)
-                minutes_diff = (end_datetime - now_datetime).total_seconds() / 60
-
-                if minutes_diff <= 15:
-                    occupancy_status = 'ending_soon'
-                    time_until_free = int(minutes_diff)
-                else:
-                    occupancy_status = 'occupied'
-                    time_until_free = int(minutes_diff)
-
-            room_statuses.append({
-                'room_id': room.id,
-                'room_name': room.name,
-                'building': room.building,
-                'floor': room.floor,
-                'capacity': room.capacity,
-                'is_occupied': is_occupied,
-                'occupancy_status': occupancy_status,
-                'time_until_free': time_until_free,
-                'reservations_today': today_reservations.count(),
-                'next_available': next_available,
-                'current_attendees': current_reservation.attendees if current_reservation else 0,
+        if content.get('type') == 'refresh':
+            all_statuses = await self.get_all_rooms_status()
+            self._last_hashes = {
+                room_status['room_id']: self._status_hash(room_status)
+                for room_status in all_statuses
+            }
+            await self.send_json({
+                'type': 'rooms.status',
+                'rooms': all_statuses
             })
 
-        return room_statuses
-
     async def room_update(self, event):
         """
         Handle room update events from any room.
-        Sends notification when any reservation changes.
+        Sends notification when any reservation changes, including the
+        room's refreshed status (from the short-TTL cache, which the
+        signal just invalidated) so clients never need a full snapshot.
         """
-        await self.send_json({
+        room_id = event.get('room_id')
+        room_status = None
+        if room_id is not None:
+            room_status = await database_sync_to_async(get_room_status)(room_id)
+            if room_status:
+                self._last_hashes[room_id] = self._status_hash(room_status)
+        await self.queue_event({
             'type': 'room.update',
-            'room_id': event.get('room_id'),
+            'room_id': room_id,
             'event_type': event.get('event_type'),
             'reservation': event.get('reservation'),
+            'room_status': room_status,
         })
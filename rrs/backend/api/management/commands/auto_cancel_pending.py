@@ -4,9 +4,11 @@ This should be run periodically via cron job or scheduler.
 Usage: python manage.py auto_cancel_pending
 """
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 from api.models import Reservation, ActivityLog
+from api.consumers import invalidate_room_status_cache
 
 
 class Command(BaseCommand):
@@ -31,41 +33,66 @@ class Command(BaseCommand):
 
         cutoff_time = timezone.now() - timedelta(minutes=minutes)
 
-        # Find pending reservations older than cutoff time
+        # Stream the scan with a server-side cursor and a narrow
+        # projection; a long-neglected pending backlog never gets
+        # materialized in memory at once. The user FK id rides along for
+        # the log rows, so no user join is needed
         pending_reservations = Reservation.objects.filter(
             status='pending',
             created_at__lt=cutoff_time
-        )
-
-        count = pending_reservations.count()
+        ).select_related('room').only('id', 'date', 'start_time', 'user', 'room__id', 'room__name')
 
         if dry_run:
+            count = 0
+            for res in pending_reservations.iterator(chunk_size=1000):
+                self.stdout.write(
+                    f'  - Reservation {res.id}: {res.room.name} on {res.date} at {res.start_time}'
+                )
+                count += 1
             self.stdout.write(
                 self.style.WARNING(
                     f'DRY RUN: Would auto-cancel {count} pending reservations older than {minutes} minutes'
                 )
             )
-            for res in pending_reservations:
-                self.stdout.write(
-                    f'  - Reservation {res.id}: {res.room.name} on {res.date} at {res.start_time}'
-                )
             return
 
-        # Auto-cancel pending reservations
+        # Cancel in bounded batches: one UPDATE plus one multi-row log
+        # INSERT per chunk, instead of a save() + create() pair per row
         cancelled_count = 0
-        for reservation in pending_reservations:
-            reservation.status = 'cancelled'
-            reservation.save()
+        affected_rooms = set()
+        batch = []
 
-            # Log activity
-            ActivityLog.objects.create(
-                user=reservation.user,
-                action='reservation_cancelled',
-                room=reservation.room,
-                reservation=reservation,
-                description=f'Auto-cancelled reservation for {reservation.room.name} due to no confirmation within {minutes} minutes'
-            )
-            cancelled_count += 1
+        def flush(batch):
+            with transaction.atomic():
+                updated = Reservation.objects.filter(
+                    id__in=[res.id for res in batch]
+                ).update(status='cancelled', updated_at=timezone.now())
+                ActivityLog.objects.bulk_create([
+                    ActivityLog(
+                        user_id=res.user_id,
+                        action='reservation_cancelled',
+                        room_id=res.room_id,
+                        reservation=res,
+                        description=f'Auto-cancelled reservation for {res.room.name} due to no confirmation within {minutes} minutes'
+                    )
+                    for res in batch
+                ])
+            return updated
+
+        for res in pending_reservations.iterator(chunk_size=1000):
+            batch.append(res)
+            affected_rooms.add(res.room_id)
+            if len(batch) >= 1000:
+                cancelled_count += flush(batch)
+                batch = []
+        if batch:
+            cancelled_count += flush(batch)
+
+        # Bulk update() bypasses the post_save broadcast, so drop the
+        # cached statuses for the affected rooms; connected clients pick
+        # up the change on the next heartbeat
+        for room_id in affected_rooms:
+            invalidate_room_status_cache(room_id)
 
         self.stdout.write(
             self.style.SUCCESS(
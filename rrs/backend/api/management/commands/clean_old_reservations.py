@@ -3,6 +3,7 @@ Management command to clean old reservations from the database.
 Usage: python manage.py clean_old_reservations --days=30
 """
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
 from django.utils import timezone
 from datetime import timedelta
 from api.models import Reservation
@@ -23,10 +24,22 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be deleted without actually deleting'
         )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Delete at most this many reservations per transaction (default: 1000)'
+        )
+        parser.add_argument(
+            '--safe',
+            action='store_true',
+            help='Use the ORM delete path (runs Django cascades and signals) instead of raw SQL'
+        )
 
     def handle(self, *args, **options):
         days = options['days']
         dry_run = options['dry_run']
+        chunk_size = options['chunk_size']
 
         cutoff_date = timezone.now().date() - timedelta(days=days)
 
@@ -45,11 +58,61 @@ class Command(BaseCommand):
             )
             return
 
-        # Delete old reservations
-        deleted_count, _ = old_reservations.delete()
+        if options['safe']:
+            deleted_count = self._delete_with_orm(old_reservations, count, chunk_size)
+        else:
+            deleted_count = self._delete_raw(cutoff_date, chunk_size)
 
         self.stdout.write(
             self.style.SUCCESS(
                 f'Successfully deleted {deleted_count} reservations older than {days} days'
             )
         )
+
+    def _delete_raw(self, cutoff_date, batch_size):
+        """
+        Fast path: a raw DELETE skips Django's cascade collector, which
+        otherwise SELECTs every related row before deleting. Activity log
+        references are nulled out first, matching the on_delete=SET_NULL
+        the ORM would apply. Rows are then deleted in LIMIT-bounded
+        batches so each transaction stays small; with the date index every
+        iteration is an index range scan.
+        """
+        deleted_count = 0
+        with connection.cursor() as cursor:
+            with transaction.atomic():
+                cursor.execute(
+                    'UPDATE api_activitylog SET reservation_id = NULL '
+                    'WHERE reservation_id IN (SELECT id FROM api_reservation WHERE date < %s)',
+                    [cutoff_date]
+                )
+            while True:
+                with transaction.atomic():
+                    cursor.execute(
+                        'DELETE FROM api_reservation WHERE id IN ('
+                        'SELECT id FROM api_reservation WHERE date < %s LIMIT %s)',
+                        [cutoff_date, batch_size]
+                    )
+                    batch_deleted = cursor.rowcount
+                if not batch_deleted:
+                    break
+                deleted_count += batch_deleted
+                self.stdout.write(f'Deleted {deleted_count} old reservations...')
+        return deleted_count
+
+    def _delete_with_orm(self, old_reservations, count, chunk_size):
+        """
+        Safe path: delete in bounded PK chunks inside short transactions,
+        so a large backlog neither holds one giant transaction (starving
+        concurrent writes) nor builds an unbounded cascade collection.
+        """
+        deleted_count = 0
+        while True:
+            ids = list(old_reservations.values_list('pk', flat=True)[:chunk_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                batch_deleted, _ = Reservation.objects.filter(pk__in=ids).delete()
+            deleted_count += batch_deleted
+            self.stdout.write(f'Deleted {deleted_count}/{count} old reservations...')
+        return deleted_count
@@ -3,13 +3,34 @@ Management command to send reminder notifications 10 minutes before reservation
 This should be run periodically (every minute) via cron job or scheduler.
 Usage: python manage.py send_reservation_reminders
 """
+from string import Template
+
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
 from api.models import Reservation, UserProfile
-from django.core.mail import send_mail
+from django.core.mail import get_connection, send_mail
 from django.conf import settings
 
+# Parsed once at import; substitute() per reservation is a single
+# C-level pass instead of re-formatting the whole body each time
+BODY_TPL = Template("""
+Hello $username,
+
+This is a reminder that your room reservation is starting in $minutes minutes.
+
+Room: $room_name ($building)
+Date: $date
+Time: $start_time - $end_time
+Purpose: $purpose
+Attendees: $attendees
+
+Please arrive on time!
+
+Best regards,
+Room Reservation System
+                """)
+
 
 class Command(BaseCommand):
     help = 'Send reminder notifications 10 minutes before reservation starts'
@@ -38,16 +59,20 @@ class Command(BaseCommand):
         start_window = target_time
         end_window = target_time + timedelta(minutes=1)
 
-        # Find reservations starting within the target window that haven't been reminded yet
-        upcoming_reservations = Reservation.objects.filter(
-            date=target_time.date(),
-            start_time__gte=start_window.time(),
-            start_time__lt=end_window.time(),
-            status='confirmed',
-            reminder_sent=False
-        ).select_related('user', 'room')
+        # Find reservations starting within the target window that haven't
+        # been reminded yet. Filtering the denormalized start_datetime is a
+        # single b-tree range scan and, unlike the (date, time-of-day)
+        # pair, stays correct when the window straddles midnight
+        upcoming_reservations = list(
+            Reservation.objects.filter(
+                start_datetime__gte=start_window,
+                start_datetime__lt=end_window,
+                status='confirmed',
+                reminder_sent=False
+            ).select_related('user', 'room')
+        )
 
-        count = upcoming_reservations.count()
+        count = len(upcoming_reservations)
 
         if count == 0:
             self.stdout.write(
@@ -69,68 +94,76 @@ class Command(BaseCommand):
                 )
             return
 
-        # Send reminders
+        # One query fetches every relevant user's reminder preference;
+        # users without a profile default to reminders enabled, matching
+        # the old DoesNotExist fallthrough
+        user_ids = {res.user_id for res in upcoming_reservations}
+        email_prefs = dict(
+            UserProfile.objects.filter(user_id__in=user_ids).values_list('user_id', 'email_reminders')
+        )
+
+        # Send reminders; every handled reservation (sent or skipped) is
+        # marked in a single UPDATE afterwards instead of a save() per row
         sent_count = 0
-        for reservation in upcoming_reservations:
-            # Check if user has email reminders enabled
-            try:
-                profile = UserProfile.objects.get(user=reservation.user)
-                if not profile.email_reminders:
+        processed_ids = []
+        # Identical for every recipient, so build it once
+        subject = f'Reminder: Room Reservation in {minutes_before} minutes'
+        # One SMTP connection for the whole batch; send_mail would
+        # otherwise open and close a connection (handshake + TLS + auth)
+        # per reminder
+        with get_connection() as connection:
+            for reservation in upcoming_reservations:
+                if not email_prefs.get(reservation.user_id, True):
                     self.stdout.write(
                         self.style.WARNING(
                             f'Skipping {reservation.user.username} - email reminders disabled'
                         )
                     )
-                    reservation.reminder_sent = True
-                    reservation.save()
+                    processed_ids.append(reservation.id)
                     continue
-            except UserProfile.DoesNotExist:
-                pass
-
-            # Send email reminder
-            try:
-                subject = f'Reminder: Room Reservation in {minutes_before} minutes'
-                message = f"""
-Hello {reservation.user.username},
-
-This is a reminder that your room reservation is starting in {minutes_before} minutes.
-
-Room: {reservation.room.name} ({reservation.room.building})
-Date: {reservation.date}
-Time: {reservation.start_time} - {reservation.end_time}
-Purpose: {reservation.purpose}
-Attendees: {reservation.attendees}
 
-Please arrive on time!
+                # Send email reminder
+                try:
+                    message = BODY_TPL.substitute(
+                        username=reservation.user.username,
+                        minutes=minutes_before,
+                        room_name=reservation.room.name,
+                        building=reservation.room.building,
+                        date=reservation.date,
+                        start_time=reservation.start_time,
+                        end_time=reservation.end_time,
+                        purpose=reservation.purpose,
+                        attendees=reservation.attendees,
+                    )
 
-Best regards,
-Room Reservation System
-                """
-
-                send_mail(
-                    subject,
-                    message,
-                    settings.DEFAULT_FROM_EMAIL,
-                    [reservation.contact_email],
-                    fail_silently=False,
-                )
+                    send_mail(
+                        subject,
+                        message,
+                        settings.DEFAULT_FROM_EMAIL,
+                        [reservation.contact_email],
+                        fail_silently=False,
+                        connection=connection,
+                    )
 
-                # Mark reminder as sent
-                reservation.reminder_sent = True
-                reservation.save()
-                sent_count += 1
+                    processed_ids.append(reservation.id)
+                    sent_count += 1
 
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f'Sent reminder to {reservation.user.username} for {reservation.room.name}'
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f'Sent reminder to {reservation.user.username} for {reservation.room.name}'
+                        )
                     )
-                )
-            except Exception as e:
-                self.stdout.write(
-                    self.style.ERROR(
-                        f'Failed to send reminder to {reservation.user.username}: {str(e)}'
+                except Exception as e:
+                    self.stdout.write(
+                        self.style.ERROR(
+                            f'Failed to send reminder to {reservation.user.username}: {str(e)}'
+                        )
                     )
-                )
+
+        # Failed sends are deliberately left unmarked so the next run
+        # retries them
+        if processed_ids:
+            Reservation.objects.filter(id__in=processed_ids).update(reminder_sent=True)
 
         self.stdout.write(
             self.style.SUCCESS(
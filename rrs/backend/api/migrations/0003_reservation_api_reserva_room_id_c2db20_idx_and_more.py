@@ -0,0 +1,23 @@
+# Generated by Django 5.2.17 on 2026-08-30 09:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_activitylog_recurringpattern_userprofile_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['room', 'date', 'status', 'start_time'], name='api_reserva_room_id_c2db20_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['date'], name='api_reserva_date_232414_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-30 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_reservation_api_reserva_room_id_c2db20_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['room', 'status'], name='api_reserva_room_id_478931_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.17 on 2026-08-30 10:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_reservation_api_reserva_room_id_478931_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['user', 'date', 'status'], name='api_reserva_user_id_3c5957_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['date', 'status', 'start_time', 'end_time'], name='api_reserva_date_96a2a6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'confirmed'])), fields=['room', 'date', 'start_time'], name='res_room_date_active_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.17 on 2026-08-30 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_reservation_api_reserva_user_id_3c5957_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['is_active', 'building', 'floor', 'name'], name='api_room_is_acti_32d497_idx'),
+        ),
+    ]
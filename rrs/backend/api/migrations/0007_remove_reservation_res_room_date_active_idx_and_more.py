@@ -0,0 +1,23 @@
+# Generated by Django 5.2.17 on 2026-08-30 10:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_room_api_room_is_acti_32d497_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reservation',
+            name='res_room_date_active_idx',
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'confirmed'])), fields=['room', 'date', 'start_time', 'end_time'], name='res_overlap_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Enforce reservation overlap exclusion in the database.
+
+    A generated tsrange column combines (date, start_time/end_time) into a
+    half-open timestamp range, and a GiST EXCLUDE constraint rejects any
+    two pending/confirmed reservations for the same room whose ranges
+    overlap. The application-level checks remain for friendly error
+    responses; this constraint is the backstop that makes them race-free.
+    bulk_create(ignore_conflicts=True) maps to ON CONFLICT DO NOTHING,
+    which also honors exclusion constraints, so the recurring path
+    silently skips rows that lose a concurrent race.
+    """
+
+    dependencies = [
+        ('api', '0007_remove_reservation_res_room_date_active_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE EXTENSION IF NOT EXISTS btree_gist;',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql=(
+                "ALTER TABLE api_reservation "
+                "ADD COLUMN time_range tsrange "
+                "GENERATED ALWAYS AS (tsrange(date + start_time, date + end_time, '[)')) STORED;"
+            ),
+            reverse_sql='ALTER TABLE api_reservation DROP COLUMN time_range;',
+        ),
+        migrations.RunSQL(
+            sql=(
+                "ALTER TABLE api_reservation "
+                "ADD CONSTRAINT reservation_no_overlap "
+                "EXCLUDE USING GIST (room_id WITH =, time_range WITH &&) "
+                "WHERE (status IN ('pending', 'confirmed'));"
+            ),
+            reverse_sql='ALTER TABLE api_reservation DROP CONSTRAINT reservation_no_overlap;',
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.17 on 2026-08-30 10:12
+
+from django.db import migrations, models
+
+
+def backfill_start_datetime(apps, schema_editor):
+    # One UPDATE backfills every existing row from the two source columns;
+    # new rows are populated by Reservation.save()
+    schema_editor.execute(
+        "UPDATE api_reservation SET start_datetime = (date + start_time)::timestamptz "
+        "WHERE start_datetime IS NULL"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_reservation_overlap_exclusion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reservation',
+            name='start_datetime',
+            field=models.DateTimeField(db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_start_datetime, migrations.RunPython.noop),
+    ]
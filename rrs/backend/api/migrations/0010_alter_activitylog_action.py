@@ -0,0 +1,18 @@
+# Generated by Django 5.2.17 on 2026-08-30 10:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_reservation_start_datetime'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activitylog',
+            name='action',
+            field=models.CharField(choices=[('reservation_created', 'Reservation Created'), ('reservation_confirmed', 'Reservation Confirmed'), ('reservation_cancelled', 'Reservation Cancelled'), ('reservation_deleted', 'Reservation Deleted'), ('reservation_checked_in', 'Reservation Checked In'), ('room_favorited', 'Room Favorited'), ('room_unfavorited', 'Room Unfavorited')], max_length=50),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.17 on 2026-08-30 10:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_alter_activitylog_action'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reservation',
+            name='api_reserva_reminde_9706b7_idx',
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(('reminder_sent', False), ('status', 'confirmed')), fields=['start_datetime'], name='res_reminder_due_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.17 on 2026-08-30 10:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_remove_reservation_api_reserva_reminde_9706b7_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='activitylog',
+            name='api_activit_created_011954_idx',
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['-created_at', '-id'], name='api_activit_created_32df64_idx'),
+        ),
+    ]
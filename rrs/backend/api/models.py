@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
 
@@ -17,6 +18,8 @@ class Room(models.Model):
         indexes = [
             models.Index(fields=["is_active"]),
             models.Index(fields=["building", "floor"]),
+            # Backs the ordered active-rooms listing
+            models.Index(fields=["is_active", "building", "floor", "name"]),
         ]
 
     def __str__(self):
@@ -25,23 +28,35 @@ class Room(models.Model):
     def get_current_occupancy_status(self):
         """Returns current occupancy status of the room"""
         now = timezone.now()
+        # Occupancy only changes at minute granularity, so cache per
+        # (room, minute bucket): serializing a room list or broadcasting
+        # an overview tick stops costing one query per room
+        key = f'occ:{self.id}:{int(now.timestamp() // 60)}'
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
         current_reservation = self.reservations.filter(
             date=now.date(),
             start_time__lte=now.time(),
             end_time__gte=now.time(),
             status='confirmed'
-        ).first()
+        ).only('id', 'end_time').first()
 
         if current_reservation:
-            return {
+            end = current_reservation.end_time
+            status = {
                 'occupied': True,
-                'reservation': current_reservation,
+                'reservation_id': current_reservation.id,
                 'time_until_free': (
-                    timezone.datetime.combine(now.date(), current_reservation.end_time) -
-                    timezone.datetime.combine(now.date(), now.time())
-                ).seconds // 60
+                    end.hour * 60 + end.minute - (now.time().hour * 60 + now.time().minute)
+                ),
             }
-        return {'occupied': False, 'reservation': None, 'time_until_free': 0}
+        else:
+            status = {'occupied': False, 'reservation_id': None, 'time_until_free': 0}
+
+        cache.set(key, status, 60)
+        return status
 
 class UserProfile(models.Model):
     THEME_CHOICES = [
@@ -62,22 +77,28 @@ class UserProfile(models.Model):
         return f"Profile for {self.user.username}"
 
 class Reservation(models.Model):
-    STATUS_CHOICES = [
-        ("pending", "Pending"),
-        ("confirmed", "Confirmed"),
-        ("cancelled", "Cancelled"),
-    ]
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        CONFIRMED = "confirmed", "Confirmed"
+        CANCELLED = "cancelled", "Cancelled"
+
+    # Kept for call sites that still reference the old tuple list
+    STATUS_CHOICES = Status.choices
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="reservations")
     room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name="reservations")
     date = models.DateField()
     start_time = models.TimeField()
     end_time = models.TimeField()
+    # Denormalized date + start_time, maintained in save(): accessors and
+    # time-window filters get a single timestamp instead of combining the
+    # two columns per call
+    start_datetime = models.DateTimeField(null=True, editable=False, db_index=True)
     purpose = models.TextField()
     attendees = models.PositiveIntegerField(default=1)
     capacity_used = models.PositiveIntegerField(default=0, help_text="Actual attendees who showed up")
     contact_email = models.EmailField()
     contact_phone = models.CharField(max_length=50, blank=True, null=True)
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     confirmation_token = models.CharField(max_length=255, blank=True, null=True)
@@ -88,28 +109,69 @@ class Reservation(models.Model):
         ordering = ["-date", "-start_time"]
         indexes = [
             models.Index(fields=["room", "date", "start_time"]),
+            # Matches the hot heartbeat/status lookup:
+            # filter(room=..., date=..., status__in=...) ordered by start_time
+            models.Index(fields=["room", "date", "status", "start_time"]),
+            # Supports clean_old_reservations' date__lt range delete
+            models.Index(fields=["date"]),
+            # Backs the per-room confirmed-count subquery on the dashboard
+            models.Index(fields=["room", "status"]),
             models.Index(fields=["user", "date"]),
+            # upcoming_reservations filters by user + status + date bounds
+            models.Index(fields=["user", "date", "status"]),
+            # Dashboard occupancy and today-count predicates
+            models.Index(fields=["date", "status", "start_time", "end_time"]),
+            # Partial index over the live statuses only: the conflict and
+            # status endpoints never look at cancelled rows, so the index
+            # stays small as cancelled history accumulates. Including
+            # end_time lets the overlap exists() probe resolve without
+            # heap fetches
+            models.Index(
+                fields=["room", "date", "start_time", "end_time"],
+                condition=models.Q(status__in=["pending", "confirmed"]),
+                name="res_overlap_idx",
+            ),
             models.Index(fields=["status", "date"]),
             models.Index(fields=["created_at"]),
-            models.Index(fields=["reminder_sent", "date", "start_time"]),
+            # Tiny partial index over unreminded confirmed reservations;
+            # the reminder cron's start_datetime range scan hits only this
+            models.Index(
+                fields=["start_datetime"],
+                condition=models.Q(status="confirmed", reminder_sent=False),
+                name="res_reminder_due_idx",
+            ),
         ]
 
     def __str__(self):
         return f"Reservation {self.id} - {self.room.name} on {self.date}"
 
+    def save(self, *args, **kwargs):
+        # Callers may assign raw strings from request.data; the ORM only
+        # coerces those at SQL prep, so normalize through the fields
+        # before combining. end_time is included because the post_save
+        # broadcast serializes it before the coercion at SQL prep happens
+        self.date = self._meta.get_field('date').to_python(self.date)
+        self.start_time = self._meta.get_field('start_time').to_python(self.start_time)
+        self.end_time = self._meta.get_field('end_time').to_python(self.end_time)
+        self.start_datetime = timezone.make_aware(
+            timezone.datetime.combine(self.date, self.start_time)
+        )
+        super().save(*args, **kwargs)
+
+    def _start_dt(self):
+        # Fallback covers rows written before the column existed or via
+        # bulk paths that didn't populate it
+        return self.start_datetime or timezone.make_aware(
+            timezone.datetime.combine(self.date, self.start_time)
+        )
+
     def is_upcoming(self):
         """Check if reservation is in the future"""
-        now = timezone.now()
-        reservation_datetime = timezone.make_aware(timezone.datetime.combine(self.date, self.start_time))
-        return reservation_datetime > now and self.status in ['pending', 'confirmed']
+        return self._start_dt() > timezone.now() and self.status in ['pending', 'confirmed']
 
     def time_until_start(self):
         """Get time until reservation starts (in minutes)"""
-        now = timezone.now()
-        reservation_datetime = timezone.make_aware(timezone.datetime.combine(self.date, self.start_time))
-        if timezone.is_naive(reservation_datetime):
-            reservation_datetime = timezone.make_aware(reservation_datetime)
-        delta = reservation_datetime - now
+        delta = self._start_dt() - timezone.now()
         return max(0, int(delta.total_seconds() // 60))
 
     def should_auto_cancel(self):
@@ -156,6 +218,7 @@ class ActivityLog(models.Model):
         ('reservation_confirmed', 'Reservation Confirmed'),
         ('reservation_cancelled', 'Reservation Cancelled'),
         ('reservation_deleted', 'Reservation Deleted'),
+        ('reservation_checked_in', 'Reservation Checked In'),
         ('room_favorited', 'Room Favorited'),
         ('room_unfavorited', 'Room Unfavorited'),
     ]
@@ -170,7 +233,8 @@ class ActivityLog(models.Model):
     class Meta:
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["-created_at"]),
+            # id tiebreak matches the feed's keyset cursor ordering
+            models.Index(fields=["-created_at", "-id"]),
             models.Index(fields=["user", "-created_at"]),
         ]
 
@@ -0,0 +1,43 @@
+"""
+Derive select_related / prefetch_related targets from a serializer.
+
+Nested serializers and dotted sources (e.g. room.name) silently cost one
+query per row unless the viewset's queryset joins them. Deriving the
+join list from the serializer itself keeps the two in lockstep: adding a
+nested field to a serializer automatically extends the queryset instead
+of reintroducing an N+1.
+"""
+from django.core.exceptions import FieldDoesNotExist
+
+
+def related_fields_for(serializer_class):
+    """Classify a ModelSerializer's relational fields.
+
+    Returns a (select, prefetch) pair of field-name tuples: forward
+    FK / one-to-one sources belong in select_related, many-valued
+    relations in prefetch_related. Non-relational and write-only fields
+    are ignored.
+    """
+    model = serializer_class.Meta.model
+    select = []
+    prefetch = []
+    for name, field in serializer_class._declared_fields.items():
+        if field.write_only:
+            continue
+        # Method fields carry source='*'; fall back to the field name so
+        # one named after a relation (e.g. a memoized nested room) still
+        # gets its join
+        source = field.source if field.source and field.source != '*' else name
+        head = source.split('.')[0]
+        try:
+            model_field = model._meta.get_field(head)
+        except FieldDoesNotExist:
+            # SerializerMethodFields and other computed sources
+            continue
+        if not model_field.is_relation:
+            continue
+        if model_field.many_to_one or model_field.one_to_one:
+            select.append(head)
+        else:
+            prefetch.append(head)
+    return tuple(select), tuple(prefetch)
@@ -1,7 +1,67 @@
+import copy
+
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
 from .models import Room, Reservation, UserProfile, RecurringPattern, ActivityLog
 
+
+class CachedFieldsMixin:
+    """Build a ModelSerializer's field map once per class.
+
+    ModelSerializer.get_fields re-runs Meta introspection (field-name
+    resolution plus build_field per column) on every instantiation. The
+    first call per class is cached as a template; later instantiations
+    deep-copy it, which DRF fields implement cheaply by re-running
+    __init__ from stored args, skipping the model introspection. Fields
+    only depend on Meta, so the template is identical across instances.
+    """
+
+    def get_fields(self):
+        cls = self.__class__
+        template = cls.__dict__.get('_fields_template')
+        if template is None:
+            template = super().get_fields()
+            cls._fields_template = template
+        return {name: copy.deepcopy(field) for name, field in template.items()}
+
+# Shared by every PrimaryKeyRelatedField that validates a room PK: the
+# existence check only needs the id column, not a fully hydrated Room
+ROOM_PK_QS = Room.objects.only('id')
+
+
+# The sub-hour strings cover nearly every row the upcoming endpoint
+# formats; interning them once turns the common case into a list index
+_COUNTDOWN_SMALL = [f"{m} minutes" for m in range(60)]
+
+
+def format_countdown(minutes):
+    """Human-readable countdown from a minute count (never negative)."""
+    if minutes < 60:
+        return _COUNTDOWN_SMALL[minutes]
+    hours = minutes // 60
+    remaining_minutes = minutes % 60
+    return f"{hours}h {remaining_minutes}m"
+
+
+def format_time_ago(diff):
+    """Human-readable 'time ago' from a timedelta."""
+    if diff.days > 0:
+        return f"{diff.days} day{'s' if diff.days > 1 else ''} ago"
+
+    hours = diff.seconds // 3600
+    if hours > 0:
+        return f"{hours} hour{'s' if hours > 1 else ''} ago"
+
+    minutes = (diff.seconds % 3600) // 60
+    if minutes > 0:
+        return f"{minutes} minute{'s' if minutes > 1 else ''} ago"
+
+    return "just now"
+
+
 # --- User Serializers ---
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
@@ -16,9 +76,11 @@ class RegisterSerializer(serializers.ModelSerializer):
             email=validated_data['email']
         )
         user.set_password(validated_data['password'])
-        user.save()
-        # Create user profile automatically
-        UserProfile.objects.create(user=user)
+        # One commit covers both inserts: the post_save signal on User
+        # creates the profile inside the same transaction, so a failure
+        # there can't leave an orphaned User row
+        with transaction.atomic():
+            user.save()
         return user
 
 class UserSerializer(serializers.ModelSerializer):
@@ -28,14 +90,14 @@ class UserSerializer(serializers.ModelSerializer):
 
 class UserProfileSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
-    favorite_rooms = serializers.PrimaryKeyRelatedField(many=True, queryset=Room.objects.all(), required=False)
+    favorite_rooms = serializers.PrimaryKeyRelatedField(many=True, queryset=ROOM_PK_QS, required=False)
 
     class Meta:
         model = UserProfile
         fields = ('id', 'user', 'theme', 'favorite_rooms', 'notifications_enabled', 'email_reminders', 'created_at', 'updated_at')
 
 # --- Room Serializers ---
-class RoomSerializer(serializers.ModelSerializer):
+class RoomSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     is_favorited = serializers.SerializerMethodField()
     current_occupancy = serializers.SerializerMethodField()
 
@@ -43,8 +105,35 @@ class RoomSerializer(serializers.ModelSerializer):
         model = Room
         fields = '__all__'
 
+    def to_representation(self, instance):
+        """Rendered output with the static columns cached per room.
+
+        Room rows rarely change and are shared by every user, so the
+        user-agnostic part of the dict is cached for an hour; only the
+        per-user/per-minute fields (is_favorited, current_occupancy) are
+        computed each time. signals.py drops the key when a Room is
+        saved or deleted.
+        """
+        cache_key = f'room:{instance.id}:base'
+        base = cache.get(cache_key)
+        if base is None:
+            base = super().to_representation(instance)
+            del base['is_favorited']
+            del base['current_occupancy']
+            cache.set(cache_key, base, 3600)
+        data = dict(base)
+        data['is_favorited'] = self.get_is_favorited(instance)
+        data['current_occupancy'] = self.get_current_occupancy(instance)
+        return data
+
     def get_is_favorited(self, obj):
         """Check if current user has favorited this room"""
+        # Views pass the user's favorited room IDs once per request, so
+        # list responses do a set lookup per row instead of an EXISTS
+        # query each
+        favorited_ids = self.context.get('favorited_ids')
+        if favorited_ids is not None:
+            return obj.id in favorited_ids
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.favorited_by.filter(user=request.user).exists()
@@ -52,6 +141,19 @@ class RoomSerializer(serializers.ModelSerializer):
 
     def get_current_occupancy(self, obj):
         """Get current occupancy status"""
+        # List views annotate the current reservation via subqueries so
+        # no per-row query is needed; the model method (which caches per
+        # minute bucket) remains the single-object fallback
+        if hasattr(obj, 'occ_reservation_id'):
+            if obj.occ_reservation_id is None:
+                return {'occupied': False, 'reservation_id': None, 'time_until_free': 0}
+            now = timezone.now().time()
+            end = obj.occ_end_time
+            return {
+                'occupied': True,
+                'reservation_id': obj.occ_reservation_id,
+                'time_until_free': end.hour * 60 + end.minute - (now.hour * 60 + now.minute),
+            }
         return obj.get_current_occupancy_status()
 
 class RoomDetailSerializer(serializers.ModelSerializer):
@@ -65,22 +167,35 @@ class RoomDetailSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def get_total_reservations(self, obj):
+        # Count('reservations', filter=Q(reservations__status='confirmed'))
+        # annotation when the view supplies it; per-row COUNT otherwise
+        count = getattr(obj, 'total_reservations_count', None)
+        if count is not None:
+            return count
         return obj.reservations.filter(status='confirmed').count()
 
     def get_is_favorited(self, obj):
+        favorited_ids = self.context.get('favorited_ids')
+        if favorited_ids is not None:
+            return obj.id in favorited_ids
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.favorited_by.filter(user=request.user).exists()
         return False
 
     def get_favorite_count(self, obj):
+        # Prefer a Count('favorited_by') annotation when the view
+        # provides one; the per-row COUNT is the uncached fallback
+        count = getattr(obj, 'favorite_count_annotated', None)
+        if count is not None:
+            return count
         return obj.favorited_by.count()
 
 # --- Reservation Serializers ---
-class ReservationSerializer(serializers.ModelSerializer):
+class ReservationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
-    room = RoomSerializer(read_only=True)
-    room_id = serializers.PrimaryKeyRelatedField(queryset=Room.objects.all(), write_only=True, source='room')
+    room = serializers.SerializerMethodField()
+    room_id = serializers.PrimaryKeyRelatedField(queryset=ROOM_PK_QS, write_only=True, source='room')
     time_until_start = serializers.SerializerMethodField()
     is_upcoming = serializers.SerializerMethodField()
 
@@ -90,6 +205,20 @@ class ReservationSerializer(serializers.ModelSerializer):
                   'attendees', 'capacity_used', 'contact_email', 'contact_phone', 'status',
                   'created_at', 'updated_at', 'reminder_sent', 'time_until_start', 'is_upcoming')
 
+    def get_room(self, obj):
+        """Nested room representation, shared across rows.
+
+        A reservation list repeats the same handful of rooms, so the
+        RoomSerializer field walk runs once per distinct room per
+        request; subsequent rows reuse the rendered dict.
+        """
+        room_reprs = self.context.setdefault('_room_reprs', {})
+        rep = room_reprs.get(obj.room_id)
+        if rep is None:
+            rep = RoomSerializer(obj.room, context=self.context).data
+            room_reprs[obj.room_id] = rep
+        return rep
+
     def get_time_until_start(self, obj):
         """Get minutes until reservation starts"""
         return obj.time_until_start()
@@ -98,7 +227,7 @@ class ReservationSerializer(serializers.ModelSerializer):
         """Check if reservation is upcoming"""
         return obj.is_upcoming()
 
-class UpcomingReservationSerializer(serializers.ModelSerializer):
+class UpcomingReservationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for upcoming reservations with countdown"""
     room_name = serializers.CharField(source='room.name', read_only=True)
     room_building = serializers.CharField(source='room.building', read_only=True)
@@ -110,29 +239,37 @@ class UpcomingReservationSerializer(serializers.ModelSerializer):
         fields = ('id', 'room_name', 'room_building', 'date', 'start_time', 'end_time',
                   'purpose', 'attendees', 'status', 'time_until_start', 'countdown_text')
 
+    def _minutes_until_start(self, obj):
+        # Computed once per row against a request-wide clock: the view
+        # passes 'now' in context, so a long list neither calls
+        # timezone.now() per row nor repeats the arithmetic for the two
+        # fields below
+        minutes = getattr(obj, '_minutes_until_start', None)
+        if minutes is None:
+            now = self.context.get('now') or timezone.now()
+            delta = obj._start_dt() - now
+            minutes = max(0, int(delta.total_seconds() // 60))
+            obj._minutes_until_start = minutes
+        return minutes
+
     def get_time_until_start(self, obj):
-        return obj.time_until_start()
+        return self._minutes_until_start(obj)
 
     def get_countdown_text(self, obj):
-        minutes = obj.time_until_start()
-        if minutes < 60:
-            return f"{minutes} minutes"
-        hours = minutes // 60
-        remaining_minutes = minutes % 60
-        return f"{hours}h {remaining_minutes}m"
+        return format_countdown(self._minutes_until_start(obj))
 
 # --- Recurring Pattern Serializers ---
 class RecurringPatternSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     room = RoomSerializer(read_only=True)
-    room_id = serializers.PrimaryKeyRelatedField(queryset=Room.objects.all(), write_only=True, source='room')
+    room_id = serializers.PrimaryKeyRelatedField(queryset=ROOM_PK_QS, write_only=True, source='room')
 
     class Meta:
         model = RecurringPattern
         fields = '__all__'
 
 # --- Activity Log Serializers ---
-class ActivityLogSerializer(serializers.ModelSerializer):
+class ActivityLogSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     room_name = serializers.CharField(source='room.name', read_only=True, allow_null=True)
     time_ago = serializers.SerializerMethodField()
@@ -143,18 +280,5 @@ class ActivityLogSerializer(serializers.ModelSerializer):
 
     def get_time_ago(self, obj):
         """Human-readable time ago"""
-        from django.utils import timezone
-        diff = timezone.now() - obj.created_at
-
-        if diff.days > 0:
-            return f"{diff.days} day{'s' if diff.days > 1 else ''} ago"
-
-        hours = diff.seconds // 3600
-        if hours > 0:
-            return f"{hours} hour{'s' if hours > 1 else ''} ago"
-
-        minutes = (diff.seconds % 3600) // 60
-        if minutes > 0:
-            return f"{minutes} minute{'s' if minutes > 1 else ''} ago"
-
-        return "just now"
+        now = self.context.get('now') or timezone.now()
+        return format_time_ago(now - obj.created_at)
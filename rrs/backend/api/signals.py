@@ -1,14 +1,85 @@
-from django.db.models.signals import post_save, post_delete
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, post_delete
 from django.dispatch import receiver
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
-from .models import Reservation, ActivityLog
-from .serializers import ReservationSerializer
+from .models import Reservation, ActivityLog, Room, UserProfile
+from .consumers import invalidate_room_status_cache
+import asyncio
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+async def _group_send_all(channel_layer, messages):
+    """Send each (group, message) pair concurrently on one event loop.
+
+    Crossing the async_to_sync bridge costs a loop spin-up per call;
+    gathering both group sends inside a single bridge pays it once and
+    pipelines the Redis commands.
+    """
+    await asyncio.gather(*(
+        channel_layer.group_send(group, message) for group, message in messages
+    ))
+
+
+def _queue_activity(**kwargs):
+    """Queue an ActivityLog row, batched per transaction.
+
+    Rows queued inside one atomic block are flushed in a single
+    bulk_create at commit, so a request that saves several reservations
+    pays one log INSERT instead of one per save; outside a transaction
+    the flush runs immediately. The buffer's lifetime is tied to its
+    flush hook: a rollback clears the connection's on_commit hooks
+    without running them, so a buffer whose hook is gone belongs to a
+    rolled-back transaction and is dropped, never flushed by a later
+    one.
+    """
+    conn = transaction.get_connection()
+    pending = getattr(conn, '_pending_activity', None)
+    if pending is not None:
+        rows, flush = pending
+        # The connection attribute survives a rollback but the
+        # registered hook does not; a live hook marks a live buffer
+        if any(entry[1] is flush for entry in conn.run_on_commit):
+            rows.append(ActivityLog(**kwargs))
+            return
+
+    rows = [ActivityLog(**kwargs)]
+
+    def flush():
+        conn._pending_activity = None
+        ActivityLog.objects.bulk_create(rows)
+
+    conn._pending_activity = (rows, flush)
+    transaction.on_commit(flush)
+
+
+def _serialize_for_ws(reservation):
+    """Flat reservation payload for WebSocket events.
+
+    Reads only attributes already on the instance (FK ids via the _id
+    descriptors), so the write path serializes without a single extra
+    query — unlike the nested ReservationSerializer, which dereferences
+    room and user and walks every field.
+    """
+    return {
+        'id': reservation.id,
+        'room_id': reservation.room_id,
+        'user_id': reservation.user_id,
+        'date': reservation.date.isoformat(),
+        'start_time': reservation.start_time.isoformat(),
+        'end_time': reservation.end_time.isoformat(),
+        'status': reservation.status,
+        'purpose': reservation.purpose,
+        'attendees': reservation.attendees,
+    }
+
+
 def broadcast_reservation_change(reservation, event_type):
     """
     Utility function to broadcast reservation changes to WebSocket clients.
@@ -18,40 +89,118 @@ def broadcast_reservation_change(reservation, event_type):
         reservation: Reservation instance
         event_type: Type of event ('created', 'confirmed', 'cancelled', 'deleted')
     """
+    # Invalidate at commit, not at save time: dropping the key while the
+    # transaction is still open lets a heartbeat recompute from the
+    # pre-commit snapshot and re-cache it for its full TTL, which the
+    # overview's room_update would then push as the refreshed status
+    room_id = reservation.room_id
+    transaction.on_commit(lambda: invalidate_room_status_cache(room_id))
+
+    # Nothing below matters without a channel layer (tests, workers
+    # without Redis) or with broadcasting disabled for bulk jobs; bail
+    # before building any payload
+    if not getattr(settings, 'BROADCAST_RESERVATIONS', True):
+        return
     channel_layer = get_channel_layer()
-    room_group_name = f'room_{reservation.room.id}'
+    if channel_layer is None:
+        return
+
+    room_group_name = f'room_{reservation.room_id}'
     overview_group_name = 'rooms_overview'
 
     # Serialize the reservation data
-    serializer = ReservationSerializer(reservation)
-    reservation_data = serializer.data
+    reservation_data = _serialize_for_ws(reservation)
+
+    # Encode the client-facing room payload once per broadcast; the room
+    # consumers forward the string as-is, so JSON encoding is paid once
+    # per event instead of once per connected subscriber.
+    room_payload_json = json.dumps({
+        'type': f'reservation.{event_type}',
+        'reservation': reservation_data,
+        'reservation_id': reservation.id,
+        'room_id': reservation.room_id,
+        'event_type': event_type,
+    })
 
     # Prepare the message for room-specific group
     room_message = {
         'type': f'reservation_{event_type}',
-        'reservation': reservation_data,
+        'payload_json': room_payload_json,
         'event_type': event_type,
         'reservation_id': reservation.id,
-        'room_id': reservation.room.id,
+        'room_id': reservation.room_id,
     }
 
-    # Prepare the message for overview group
+    # Prepare the message for overview group; the overview consumer
+    # builds its own delta from room_id/event_type, so no payload is
+    # pre-encoded here — just the minimal stanza the frontend reads for
+    # notification text and its own-reservation refresh check
     overview_message = {
         'type': 'room_update',
-        'room_id': reservation.room.id,
+        'room_id': reservation.room_id,
         'event_type': event_type,
-        'reservation': reservation_data,
+        'reservation': {
+            'id': reservation.id,
+            'user': {'id': reservation.user_id},
+            'room': {'name': reservation.room.name},
+        },
     }
 
     # Send to the room's group - gracefully handle Redis connection errors
-    if channel_layer:
+    def _send():
         try:
-            async_to_sync(channel_layer.group_send)(room_group_name, room_message)
-            async_to_sync(channel_layer.group_send)(overview_group_name, overview_message)
+            async_to_sync(_group_send_all)(channel_layer, [
+                (room_group_name, room_message),
+                (overview_group_name, overview_message),
+            ])
         except Exception as e:
             # Log the error but don't crash - WebSocket broadcasting is optional
             logger.warning(f"Failed to broadcast reservation {event_type} (Redis not available): {e}")
 
+    # Deferred to commit: the Redis round-trips run after the row is
+    # durable instead of extending the transaction (and any row
+    # locks it holds), and a rolled-back save broadcasts nothing.
+    # Outside a transaction this runs immediately
+    transaction.on_commit(_send)
+
+
+@receiver(post_save, sender=User)
+def create_user_profile(sender, instance, created, **kwargs):
+    """
+    Ensure every user gets a profile at creation time, so the profile
+    lookups in the views resolve to a plain SELECT instead of paying the
+    get_or_create savepoint on first access.
+    """
+    if created:
+        UserProfile.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def invalidate_room_base_cache(sender, instance, **kwargs):
+    """
+    Drop the cached user-agnostic serializer output for a room when its
+    row changes; reservation traffic never touches this key.
+    """
+    cache.delete(f'room:{instance.id}:base')
+
+
+@receiver(m2m_changed, sender=UserProfile.favorite_rooms.through)
+def favorite_rooms_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Drop the per-user cached favorite-room-ID set when favorites change
+    through the M2M manager (.add/.remove/.set, e.g. from the admin).
+    The API's favorite toggle writes the through table directly and
+    invalidates on its own.
+    """
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        cache.delete(f'favs:{instance.user_id}')
+    elif pk_set:
+        user_ids = UserProfile.objects.filter(id__in=pk_set).values_list('user_id', flat=True)
+        cache.delete_many([f'favs:{user_id}' for user_id in user_ids])
+
 
 @receiver(post_save, sender=Reservation)
 def reservation_post_save(sender, instance, created, **kwargs):
@@ -64,10 +213,10 @@ def reservation_post_save(sender, instance, created, **kwargs):
         # New reservation created
         broadcast_reservation_change(instance, 'created')
         # Log activity
-        ActivityLog.objects.create(
-            user=instance.user,
+        _queue_activity(
+            user_id=instance.user_id,
             action='reservation_created',
-            room=instance.room,
+            room_id=instance.room_id,
             reservation=instance,
             description=f'Created reservation for {instance.room.name} on {instance.date} at {instance.start_time}'
         )
@@ -76,20 +225,20 @@ def reservation_post_save(sender, instance, created, **kwargs):
         if instance.status == 'confirmed':
             broadcast_reservation_change(instance, 'confirmed')
             # Log activity
-            ActivityLog.objects.create(
-                user=instance.user,
+            _queue_activity(
+                user_id=instance.user_id,
                 action='reservation_confirmed',
-                room=instance.room,
+                room_id=instance.room_id,
                 reservation=instance,
                 description=f'Confirmed reservation for {instance.room.name} on {instance.date}'
             )
         elif instance.status == 'cancelled':
             broadcast_reservation_change(instance, 'cancelled')
             # Log activity
-            ActivityLog.objects.create(
-                user=instance.user,
+            _queue_activity(
+                user_id=instance.user_id,
                 action='reservation_cancelled',
-                room=instance.room,
+                room_id=instance.room_id,
                 reservation=instance,
                 description=f'Cancelled reservation for {instance.room.name} on {instance.date}'
             )
@@ -104,36 +253,68 @@ def reservation_post_delete(sender, instance, **kwargs):
     Also logs deletion activity.
     """
     # Log activity before deletion
-    ActivityLog.objects.create(
-        user=instance.user,
+    _queue_activity(
+        user_id=instance.user_id,
         action='reservation_deleted',
-        room=instance.room,
+        room_id=instance.room_id,
         description=f'Deleted reservation for {instance.room.name} on {instance.date} at {instance.start_time}'
     )
 
+    # As above: drop the cached status only once the delete is durable,
+    # so a pre-commit heartbeat can't re-cache the old snapshot
+    room_id = instance.room_id
+    transaction.on_commit(lambda: invalidate_room_status_cache(room_id))
+
+    # Bail before building any payload when broadcasting is off or no
+    # channel layer is configured
+    if not getattr(settings, 'BROADCAST_RESERVATIONS', True):
+        return
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+
     # For deleted reservations, we need to send minimal data
     # since the instance is being deleted
-    channel_layer = get_channel_layer()
-    room_group_name = f'room_{instance.room.id}'
+    room_group_name = f'room_{instance.room_id}'
     overview_group_name = 'rooms_overview'
 
     message = {
         'type': 'reservation_deleted',
+        'payload_json': json.dumps({
+            'type': 'reservation.deleted',
+            'reservation_id': instance.id,
+            'room_id': instance.room_id,
+            'event_type': 'deleted',
+        }),
         'event_type': 'deleted',
         'reservation_id': instance.id,
-        'room_id': instance.room.id,
+        'room_id': instance.room_id,
     }
 
+    # The overview consumer builds its own delta from room_id and
+    # event_type; the minimal stanza feeds the frontend's notification
+    # text and own-reservation refresh check
     overview_message = {
         'type': 'room_update',
-        'room_id': instance.room.id,
+        'room_id': instance.room_id,
         'event_type': 'deleted',
+        'reservation': {
+            'id': instance.id,
+            'user': {'id': instance.user_id},
+            'room': {'name': instance.room.name},
+        },
     }
 
-    if channel_layer:
+    def _send():
         try:
-            async_to_sync(channel_layer.group_send)(room_group_name, message)
-            async_to_sync(channel_layer.group_send)(overview_group_name, overview_message)
+            async_to_sync(_group_send_all)(channel_layer, [
+                (room_group_name, message),
+                (overview_group_name, overview_message),
+            ])
         except Exception as e:
             # Log the error but don't crash - WebSocket broadcasting is optional
             logger.warning(f"Failed to broadcast reservation deletion (Redis not available): {e}")
+
+    # As in broadcast_reservation_change: broadcast after commit so a
+    # rolled-back delete is never announced
+    transaction.on_commit(_send)
@@ -3,14 +3,16 @@ from django.core import signing
 SALT = "reservation-confirm-salt"
 TOKEN_AGE_SECONDS = 60 * 60 * 24  # 1 day
 
+# TimestampSigner is stateless after construction and safe to share, so
+# build it once instead of re-deriving the HMAC key on every call.
+_SIGNER = signing.TimestampSigner(salt=SALT)
+
 def make_reservation_token(reservation_id):
-    signer = signing.TimestampSigner(salt=SALT)
-    return signer.sign(str(reservation_id))
+    return _SIGNER.sign(str(reservation_id))
 
 def parse_reservation_token(token, max_age=TOKEN_AGE_SECONDS):
-    signer = signing.TimestampSigner(salt=SALT)
     try:
-        value = signer.unsign(token, max_age=max_age)
+        value = _SIGNER.unsign(token, max_age=max_age)
         return int(value)
     except Exception:
         return None
@@ -1,34 +1,46 @@
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 from .views import (
     RegisterView, CurrentUserView, RoomViewSet, ReservationViewSet,
-    reservation_confirm, dashboard_stats, activity_feed, user_profile
+    reservation_confirm, create_recurring_reservation, preview_recurring_reservation,
+    check_in_reservation,
+    generate_reservation_qr, dashboard_stats, activity_feed, user_profile
 )
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-router = DefaultRouter()
+# SimpleRouter skips the browsable API root and the .json/.api format
+# suffix patterns DefaultRouter registers — fewer patterns for the
+# resolver to try on every request
+router = SimpleRouter()
 router.register(r'rooms', RoomViewSet, basename='room')
 router.register(r'reservations', ReservationViewSet, basename='reservation')
 
+# Resolution is a linear scan in declaration order, so the hottest
+# routes come first. The extra reservations paths must stay ahead of the
+# router include or its detail pattern would swallow them
 urlpatterns = [
-    # Authentication
-    path('auth/register/', RegisterView.as_view(), name='register'),
-    path('auth/login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-    path('auth/me/', CurrentUserView.as_view(), name='current_user'),
-
-    # Reservations
-    path('reservations/confirm/', reservation_confirm, name='reservation-confirm'),
-
     # Statistics & Dashboard
     path('stats/dashboard/', dashboard_stats, name='dashboard-stats'),
 
     # Activity Feed
     path('activity/feed/', activity_feed, name='activity-feed'),
 
-    # User Profile
-    path('profile/', user_profile, name='user-profile'),
+    # Reservations
+    path('reservations/confirm/', reservation_confirm, name='reservation-confirm'),
+    path('reservations/recurring/', create_recurring_reservation, name='reservation-recurring'),
+    path('reservations/recurring/preview/', preview_recurring_reservation, name='reservation-recurring-preview'),
+    path('reservations/checkin/', check_in_reservation, name='reservation-checkin'),
+    path('reservations/<int:reservation_id>/qr/', generate_reservation_qr, name='reservation-qr'),
 
     # Router URLs (rooms, reservations viewsets)
     path('', include(router.urls)),
+
+    # Authentication
+    path('auth/register/', RegisterView.as_view(), name='register'),
+    path('auth/login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('auth/me/', CurrentUserView.as_view(), name='current_user'),
+
+    # User Profile
+    path('profile/', user_profile, name='user-profile'),
 ]
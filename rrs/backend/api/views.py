@@ -3,18 +3,72 @@ from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from django.contrib.auth.models import User
-from django.db.models import Q, Count, Avg, Sum
+from django.db import transaction
+from django.db.models import Q, Count, Avg, Sum, Prefetch, Subquery, OuterRef, Exists
+from django.db.models.functions import Coalesce
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.core.cache import cache
 from .models import Room, Reservation, UserProfile, ActivityLog, RecurringPattern
 from .serializers import (
     RegisterSerializer, UserSerializer, RoomSerializer, ReservationSerializer,
-    UserProfileSerializer, ActivityLogSerializer, UpcomingReservationSerializer,
-    RoomDetailSerializer, RecurringPatternSerializer
+    UserProfileSerializer, RoomDetailSerializer, RecurringPatternSerializer,
+    format_countdown, format_time_ago
 )
+from .prefetching import related_fields_for
+from .signals import _queue_activity
+import base64
+import calendar
+import hashlib
+import io
+import json
+import time as pytime
+
+import qrcode
+from qrcode.image.pure import PyPNGImage
+from collections import defaultdict
 from datetime import datetime, date, time, timedelta
 
+# Statuses that count as a live booking; shared by every occupancy,
+# conflict and count filter below
+ACTIVE_STATUSES = ['pending', 'confirmed']
+
+# English day names indexed by date.weekday(); a list lookup avoids
+# running strftime's locale-aware formatter for every preview row
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+def _get_profile(user):
+    """Fetch the user's profile once per request.
+
+    The result is memoized on the user object, so endpoints that need the
+    profile more than once in a request pay for a single query. Profiles
+    are created by the post_save signal on User, so in steady state the
+    get_or_create resolves to a plain SELECT.
+    """
+    if not hasattr(user, '_cached_profile'):
+        user._cached_profile, _ = UserProfile.objects.get_or_create(user=user)
+    return user._cached_profile
+
+
+def _favorited_room_ids(request):
+    """Room IDs the current user has favorited.
+
+    Passed into serializer context so is_favorited is a set lookup per
+    room instead of an EXISTS query per row. Favorites change rarely, so
+    the set is cached per user; the favorite toggle and the m2m_changed
+    receiver in signals.py drop the key on change.
+    """
+    if not request.user.is_authenticated:
+        return frozenset()
+    cache_key = f'favs:{request.user.id}'
+    ids = cache.get(cache_key)
+    if ids is None:
+        ids = frozenset(_get_profile(request.user).favorite_rooms.values_list('id', flat=True))
+        cache.set(cache_key, ids, 3600)
+    return ids
+
+
 # --- User Registration ---
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
@@ -35,15 +89,38 @@ class RoomViewSet(viewsets.ViewSet):
 
     def list(self, request):
         """List all active rooms"""
-        rooms = Room.objects.filter(is_active=True)
-        serializer = RoomSerializer(rooms, many=True)
+        # Correlated subqueries fold the per-room occupancy lookup into
+        # the listing query itself; the serializer reads the annotations
+        # instead of calling the model method once per row
+        now = timezone.now()
+        current_reservation = Reservation.objects.filter(
+            room=OuterRef('pk'),
+            date=now.date(),
+            start_time__lte=now.time(),
+            end_time__gte=now.time(),
+            status='confirmed'
+        ).order_by('start_time')
+        # Deterministic ordering matching the (is_active, building, floor,
+        # name) index, so the listing never falls back to an unordered
+        # scan + sort
+        rooms = Room.objects.filter(is_active=True).annotate(
+            occ_reservation_id=Subquery(current_reservation.values('id')[:1]),
+            occ_end_time=Subquery(current_reservation.values('end_time')[:1]),
+        ).order_by('building', 'floor', 'name')
+        serializer = RoomSerializer(
+            rooms, many=True,
+            context={'request': request, 'favorited_ids': _favorited_room_ids(request)}
+        )
         return Response(serializer.data)
 
     def retrieve(self, request, pk=None):
         """Retrieve a specific room by ID"""
         try:
             room = Room.objects.get(pk=pk, is_active=True)
-            serializer = RoomSerializer(room)
+            serializer = RoomSerializer(
+                room,
+                context={'request': request, 'favorited_ids': _favorited_room_ids(request)}
+            )
             return Response(serializer.data)
         except Room.DoesNotExist:
             return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -55,64 +132,75 @@ class RoomViewSet(viewsets.ViewSet):
         Returns room information with current occupancy, reservations today, and next available slot.
         GET /api/rooms/status/
         """
-        # Try to get from cache first
+        # Stale-while-revalidate: entries fresher than the TTL are served
+        # directly; stale-but-present entries are still served while the
+        # first request to win the lock recomputes, so a cache expiry
+        # under burst traffic runs the heavy query once, not once per
+        # concurrent request
         cache_key = 'room_status_all'
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
+        lock_key = 'room_status_all_lock'
+        cached = cache.get(cache_key)
+        if cached is not None:
+            age = pytime.time() - cached['computed_at']
+            if age < 30 or not cache.add(lock_key, '1', 10):
+                return Response(cached['data'])
 
-        rooms = Room.objects.filter(is_active=True).prefetch_related('reservations')
         now = timezone.now()
         today = now.date()
         current_time = now.time()
 
+        # Everything is computed in one annotated query: a filtered Count
+        # for today's total, an Exists probe for occupancy and correlated
+        # Subqueries for the current and next reservation, so the database
+        # does all the per-room work in a single round trip
+        current_reservation = Reservation.objects.filter(
+            room=OuterRef('pk'),
+            date=today,
+            start_time__lte=current_time,
+            end_time__gte=current_time,
+            status__in=ACTIVE_STATUSES
+        ).order_by('start_time')
+        next_reservation = Reservation.objects.filter(
+            room=OuterRef('pk'),
+            date=today,
+            start_time__gt=current_time,
+            status__in=ACTIVE_STATUSES
+        ).order_by('start_time')
+
+        rooms = Room.objects.filter(is_active=True).annotate(
+            reservations_today_count=Count(
+                'reservations',
+                filter=Q(
+                    reservations__date=today,
+                    reservations__status__in=ACTIVE_STATUSES
+                )
+            ),
+            currently_occupied=Exists(current_reservation),
+            current_end_time=Subquery(current_reservation.values('end_time')[:1]),
+            current_attendees=Subquery(current_reservation.values('attendees')[:1]),
+            next_start_time=Subquery(next_reservation.values('start_time')[:1]),
+        )
+
+        current_minutes = current_time.hour * 60 + current_time.minute
         room_statuses = []
         for room in rooms:
-            # Get today's reservations
-            today_reservations = Reservation.objects.filter(
-                room=room,
-                date=today,
-                status__in=['pending', 'confirmed']
-            ).order_by('start_time')
-
-            # Calculate current occupancy
-            is_occupied = False
-            current_reservation = None
-            for res in today_reservations:
-                if res.start_time <= current_time <= res.end_time:
-                    is_occupied = True
-                    current_reservation = res
-                    break
-
-            # Find next reservation
-            next_reservation = None
-            for res in today_reservations:
-                if res.start_time > current_time:
-                    next_reservation = res
-                    break
+            is_occupied = room.currently_occupied
 
             # Calculate next available time
             next_available = None
-            if is_occupied and current_reservation:
-                next_available = current_reservation.end_time.strftime('%H:%M')
-            elif next_reservation:
-                next_available = next_reservation.start_time.strftime('%H:%M')
+            if is_occupied:
+                next_available = room.current_end_time.strftime('%H:%M')
+            elif room.next_start_time:
+                next_available = room.next_start_time.strftime('%H:%M')
 
             # Occupancy status: free, occupied, ending_soon (within 15 min)
             occupancy_status = 'free'
             time_until_free = None
             if is_occupied:
-                # Calculate minutes until reservation ends
-                end_datetime = timezone.datetime.combine(today, current_reservation.end_time)
-                now_datetime = timezone.datetime.combine(today, current_time)
-                minutes_diff = (end_datetime - now_datetime).total_seconds() / 60
-
-                if minutes_diff <= 15:
-                    occupancy_status = 'ending_soon'
-                    time_until_free = int(minutes_diff)
-                else:
-                    occupancy_status = 'occupied'
-                    time_until_free = int(minutes_diff)
+                end = room.current_end_time
+                minutes_diff = end.hour * 60 + end.minute - current_minutes
+                occupancy_status = 'ending_soon' if minutes_diff <= 15 else 'occupied'
+                time_until_free = minutes_diff
 
             room_statuses.append({
                 'room_id': room.id,
@@ -123,13 +211,15 @@ class RoomViewSet(viewsets.ViewSet):
                 'is_occupied': is_occupied,
                 'occupancy_status': occupancy_status,
                 'time_until_free': time_until_free,
-                'reservations_today': today_reservations.count(),
+                'reservations_today': room.reservations_today_count,
                 'next_available': next_available,
-                'current_attendees': current_reservation.attendees if current_reservation else 0,
+                'current_attendees': room.current_attendees if is_occupied else 0,
             })
 
-        # Cache for 30 seconds
-        cache.set(cache_key, room_statuses, 30)
+        # Fresh for 30 seconds, then servable as stale for another 30
+        # while a single refresh runs
+        cache.set(cache_key, {'data': room_statuses, 'computed_at': pytime.time()}, 60)
+        cache.delete(lock_key)
         return Response(room_statuses)
 
     @action(detail=True, methods=['get'], url_path='availability')
@@ -154,42 +244,55 @@ class RoomViewSet(viewsets.ViewSet):
             )
 
         try:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+            # fromisoformat skips strptime's per-call format parsing
+            start_date = date.fromisoformat(start_date_str)
+            end_date = date.fromisoformat(end_date_str)
         except ValueError:
             return Response(
                 {"error": "Invalid date format. Use YYYY-MM-DD"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Get all reservations in the date range
+        # Fetch the whole range once and bucket by date in Python;
+        # filtering the queryset inside the loop would issue one query
+        # per day in the range
         reservations = Reservation.objects.filter(
             room=room,
-            date__gte=start_date,
-            date__lte=end_date,
-            status__in=['pending', 'confirmed']
-        ).order_by('date', 'start_time')
+            date__range=(start_date, end_date),
+            status__in=ACTIVE_STATUSES
+        ).order_by('date', 'start_time').only(
+            'id', 'date', 'start_time', 'end_time', 'status', 'attendees'
+        )
+
+        # Long ranges stream through a server-side cursor so memory stays
+        # bounded at chunk_size instances instead of the whole range;
+        # short ranges keep the single-fetch fast path
+        if (end_date - start_date).days > 60:
+            reservations = reservations.iterator(chunk_size=500)
+
+        # Bucket the response dicts directly, so streamed instances are
+        # dropped as soon as their row is rendered
+        reservations_by_date = defaultdict(list)
+        for res in reservations:
+            reservations_by_date[res.date].append({
+                'id': res.id,
+                'start_time': res.start_time.strftime('%H:%M'),
+                'end_time': res.end_time.strftime('%H:%M'),
+                'status': res.status,
+                'attendees': res.attendees
+            })
 
         # Build availability data by date
         availability_by_date = {}
         current_date = start_date
         while current_date <= end_date:
             date_str = current_date.strftime('%Y-%m-%d')
-            day_reservations = reservations.filter(date=current_date)
+            day_reservations = reservations_by_date[current_date]
 
             availability_by_date[date_str] = {
                 'date': date_str,
-                'is_available': day_reservations.count() < 24,  # Assuming hourly slots
-                'reservations': [
-                    {
-                        'id': res.id,
-                        'start_time': res.start_time.strftime('%H:%M'),
-                        'end_time': res.end_time.strftime('%H:%M'),
-                        'status': res.status,
-                        'attendees': res.attendees
-                    }
-                    for res in day_reservations
-                ]
+                'is_available': len(day_reservations) < 24,  # Assuming hourly slots
+                'reservations': day_reservations
             }
             current_date += timedelta(days=1)
 
@@ -212,28 +315,37 @@ class RoomViewSet(viewsets.ViewSet):
         except Room.DoesNotExist:
             return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        # Get or create user profile
-        profile, created = UserProfile.objects.get_or_create(user=request.user)
+        profile = _get_profile(request.user)
 
-        # Toggle favorite
-        if profile.favorite_rooms.filter(pk=room.pk).exists():
-            profile.favorite_rooms.remove(room)
-            is_favorited = False
-            action_type = 'room_unfavorited'
-            message = "Room removed from favorites"
-        else:
-            profile.favorite_rooms.add(room)
-            is_favorited = True
-            action_type = 'room_favorited'
-            message = "Room added to favorites"
+        # Toggle through the M2M join table directly: one get_or_create
+        # replaces the exists-check plus add/remove pair
+        FavoriteRoom = UserProfile.favorite_rooms.through
+        with transaction.atomic():
+            favorite, is_favorited = FavoriteRoom.objects.get_or_create(
+                userprofile_id=profile.id,
+                room_id=room.id
+            )
+            if is_favorited:
+                action_type = 'room_favorited'
+                message = "Room added to favorites"
+            else:
+                favorite.delete()
+                action_type = 'room_unfavorited'
+                message = "Room removed from favorites"
+
+            # Queued log row: flushed by bulk_create at commit, so the
+            # INSERT happens after the toggle's transaction releases its
+            # locks instead of inside it
+            _queue_activity(
+                user=request.user,
+                action=action_type,
+                room=room,
+                description=f"User {request.user.username} {action_type.replace('_', ' ')} {room.name}"
+            )
 
-        # Log activity
-        ActivityLog.objects.create(
-            user=request.user,
-            action=action_type,
-            room=room,
-            description=f"User {request.user.username} {action_type.replace('_', ' ')} {room.name}"
-        )
+        # The through-model toggle bypasses m2m_changed, so drop the
+        # cached favorite set here
+        cache.delete(f'favs:{request.user.id}')
 
         return Response({
             'message': message,
@@ -256,16 +368,46 @@ class ReservationViewSet(viewsets.ViewSet):
             return [IsAuthenticated()]
         return [AllowAny()]
 
+    # Derived from the serializer's own field graph so the joins stay in
+    # lockstep with what it reads: user and room today, plus whatever
+    # nested field gets added next
+    SELECT_RELATED, PREFETCH_RELATED = related_fields_for(ReservationSerializer)
+
+    def get_queryset(self):
+        """Base queryset with every relation the serializer reads joined,
+        so serializers and signal handlers never trigger per-row
+        user/room lookups."""
+        qs = Reservation.objects.select_related(*self.SELECT_RELATED)
+        if self.PREFETCH_RELATED:
+            qs = qs.prefetch_related(*self.PREFETCH_RELATED)
+        return qs
+
+    # Columns the list serializer actually reads; everything else (notably
+    # the user's password/permission columns) stays in the database.
+    # RoomSerializer uses '__all__', so every room column is required.
+    LIST_FIELDS = (
+        'id', 'date', 'start_time', 'end_time', 'start_datetime', 'purpose', 'attendees',
+        'capacity_used', 'contact_email', 'contact_phone', 'status',
+        'created_at', 'updated_at', 'reminder_sent',
+        'user__id', 'user__username', 'user__email',
+        'room__id', 'room__name', 'room__building', 'room__floor',
+        'room__capacity', 'room__amenities', 'room__image',
+        'room__room_image_url', 'room__is_active',
+    )
+
     def list(self, request):
         """List all reservations"""
-        reservations = Reservation.objects.all().select_related('user', 'room')
+        reservations = self.get_queryset().only(*self.LIST_FIELDS)
         serializer = ReservationSerializer(reservations, many=True)
         return Response(serializer.data)
 
     def retrieve(self, request, pk=None):
         """Retrieve a specific reservation by ID"""
         try:
-            reservation = Reservation.objects.select_related('user', 'room').get(pk=pk)
+            # Same projection as the list: the serializer reads nothing
+            # beyond these, and the user's password/permission columns
+            # stay in the database
+            reservation = self.get_queryset().only(*self.LIST_FIELDS).get(pk=pk)
             serializer = ReservationSerializer(reservation)
             return Response(serializer.data)
         except Reservation.DoesNotExist:
@@ -283,12 +425,6 @@ class ReservationViewSet(viewsets.ViewSet):
         if not room_id:
             return Response({"error": "Room ID is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Verify room exists
-        try:
-            room = Room.objects.get(pk=room_id, is_active=True)
-        except Room.DoesNotExist:
-            return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
-
         # Extract reservation data
         reservation_date = request.data.get('date')
         start_time = request.data.get('startTime') or request.data.get('start_time')
@@ -305,34 +441,44 @@ class ReservationViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Check for overlapping reservations
-        overlapping = Reservation.objects.filter(
-            room=room,
-            date=reservation_date,
-            status__in=['pending', 'confirmed']
-        ).filter(
-            Q(start_time__lt=end_time, end_time__gt=start_time)
-        ).exists()
+        # Lock the room row for the duration of the check-then-insert:
+        # two concurrent requests for the same slot would otherwise both
+        # pass the overlap check and both insert
+        with transaction.atomic():
+            try:
+                room = Room.objects.select_for_update().get(pk=room_id, is_active=True)
+            except Room.DoesNotExist:
+                return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
+
+            # Check for overlapping reservations (inside the lock); one
+            # flat filter keeps all predicates in a single WHERE clause
+            overlapping = Reservation.objects.filter(
+                room=room,
+                date=reservation_date,
+                status__in=ACTIVE_STATUSES,
+                start_time__lt=end_time,
+                end_time__gt=start_time
+            ).exists()
 
-        if overlapping:
-            return Response(
-                {"error": "This time slot is already reserved for the selected room"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+            if overlapping:
+                return Response(
+                    {"error": "This time slot is already reserved for the selected room"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
 
-        # Create reservation
-        reservation = Reservation.objects.create(
-            user=request.user,
-            room=room,
-            date=reservation_date,
-            start_time=start_time,
-            end_time=end_time,
-            purpose=purpose,
-            attendees=attendees,
-            contact_email=contact_email,
-            contact_phone=contact_phone,
-            status='pending'
-        )
+            # Create reservation
+            reservation = Reservation.objects.create(
+                user=request.user,
+                room=room,
+                date=reservation_date,
+                start_time=start_time,
+                end_time=end_time,
+                purpose=purpose,
+                attendees=attendees,
+                contact_email=contact_email,
+                contact_phone=contact_phone,
+                status='pending'
+            )
 
         serializer = ReservationSerializer(reservation)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -343,7 +489,9 @@ class ReservationViewSet(viewsets.ViewSet):
         Users can only delete their own reservations
         """
         try:
-            reservation = Reservation.objects.get(pk=pk)
+            # select_related covers the ownership check and the room/user
+            # access in the post_delete signal handler
+            reservation = self.get_queryset().get(pk=pk)
 
             # Check if user owns this reservation
             if reservation.user != request.user:
@@ -365,7 +513,7 @@ class ReservationViewSet(viewsets.ViewSet):
         """
         try:
             user = User.objects.get(pk=user_id)
-            reservations = Reservation.objects.filter(user=user).select_related('user', 'room')
+            reservations = self.get_queryset().filter(user=user).only(*self.LIST_FIELDS)
             serializer = ReservationSerializer(reservations, many=True)
             return Response(serializer.data)
         except User.DoesNotExist:
@@ -380,19 +528,43 @@ class ReservationViewSet(viewsets.ViewSet):
         now = timezone.now()
         today = now.date()
 
-        # Get upcoming reservations for the current user
-        upcoming = Reservation.objects.filter(
+        # values() instead of model hydration: the payload is a flat
+        # re-shaping of scalar columns plus the countdown, so building
+        # Reservation/Room instances per row buys nothing
+        rows = list(Reservation.objects.filter(
             user=request.user,
-            status__in=['pending', 'confirmed']
+            status__in=ACTIVE_STATUSES
         ).filter(
             Q(date__gt=today) |
             Q(date=today, start_time__gt=now.time())
-        ).select_related('room').order_by('date', 'start_time')[:10]
+        ).order_by('date', 'start_time').values(
+            'id', 'date', 'start_time', 'end_time', 'start_datetime', 'purpose',
+            'attendees', 'status', 'room__name', 'room__building'
+        )[:10])
+
+        reservations = []
+        for row in rows:
+            start_dt = row['start_datetime'] or timezone.make_aware(
+                datetime.combine(row['date'], row['start_time'])
+            )
+            minutes = max(0, int((start_dt - now).total_seconds() // 60))
+            reservations.append({
+                'id': row['id'],
+                'room_name': row['room__name'],
+                'room_building': row['room__building'],
+                'date': row['date'],
+                'start_time': row['start_time'],
+                'end_time': row['end_time'],
+                'purpose': row['purpose'],
+                'attendees': row['attendees'],
+                'status': row['status'],
+                'time_until_start': minutes,
+                'countdown_text': format_countdown(minutes),
+            })
 
-        serializer = UpcomingReservationSerializer(upcoming, many=True)
         return Response({
-            'count': upcoming.count(),
-            'reservations': serializer.data
+            'count': len(reservations),
+            'reservations': reservations
         })
 
 # --- Confirm Reservation ---
@@ -411,9 +583,12 @@ def reservation_confirm(request):
     try:
         reservation = Reservation.objects.select_related('user', 'room').get(pk=reservation_id)
 
-        # Update status to confirmed
+        # Update status to confirmed. update_fields keeps the UPDATE to
+        # the changed columns instead of writing every field back, while
+        # still going through save() so the post_save broadcast and
+        # activity-log signals fire (a queryset .update() would skip both)
         reservation.status = 'confirmed'
-        reservation.save()
+        reservation.save(update_fields=['status', 'updated_at'])
 
         serializer = ReservationSerializer(reservation)
         return Response(serializer.data)
@@ -421,7 +596,418 @@ def reservation_confirm(request):
         return Response({"error": "Reservation not found"}, status=status.HTTP_404_NOT_FOUND)
 
 
+# --- Recurring Reservations ---
+def _generate_occurrence_dates(frequency, start_date, end_date):
+    """Build the full occurrence-date list for a recurrence in one shot.
+
+    Fixed-step frequencies are a single comprehension sized from the day
+    span; monthly advances month-by-month, clamping to the last day of
+    shorter months (a plain .replace() raises for e.g. Jan 31 -> Feb).
+    """
+    if frequency == 'monthly':
+        dates = []
+        current = start_date
+        while current <= end_date:
+            dates.append(current)
+            month = current.month % 12 + 1
+            year = current.year + (current.month == 12)
+            day = min(start_date.day, calendar.monthrange(year, month)[1])
+            current = date(year, month, day)
+        return dates
+
+    step = {'daily': 1, 'weekly': 7, 'biweekly': 14}[frequency]
+    span_days = (end_date - start_date).days
+    return [start_date + timedelta(days=step * i) for i in range(span_days // step + 1)]
+
+
+def _conflicting_series_dates(room, reservation_dates, start_time, end_time):
+    """Return the subset of reservation_dates whose (start_time, end_time)
+    slot overlaps an existing active reservation for the room.
+
+    One query pulls the candidate rows, sorted so the (room, date,
+    start_time) index drives the scan, then a single Python sweep marks
+    conflicting dates; per date, anything starting at or after the
+    requested end_time can no longer overlap.
+    """
+    wanted = set(reservation_dates)
+    existing = Reservation.objects.filter(
+        room=room,
+        status__in=ACTIVE_STATUSES
+    )
+    # Long horizons (a daily series over years) would push hundreds of
+    # parameters into an IN-list; past a threshold a plain range scan
+    # plus the in-Python membership check below is cheaper to plan and
+    # parse
+    if len(reservation_dates) > 100:
+        existing = existing.filter(
+            date__range=(min(reservation_dates), max(reservation_dates))
+        )
+    else:
+        existing = existing.filter(date__in=reservation_dates)
+    existing = existing.order_by('date', 'start_time').values_list('date', 'start_time', 'end_time')
+
+    conflicting_dates = set()
+    skip_date = None
+    for res_date, res_start, res_end in existing:
+        if res_date == skip_date or res_date not in wanted:
+            continue
+        if res_start >= end_time:
+            # Sorted by start_time, so the rest of this date is clear
+            skip_date = res_date
+            continue
+        if res_end > start_time:
+            conflicting_dates.add(res_date)
+            skip_date = res_date
+    return conflicting_dates
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_recurring_reservation(request):
+    """
+    Create a recurring reservation series (daily/weekly/biweekly/monthly).
+    Conflicting dates are skipped and reported; the rest are created in
+    a single bulk insert.
+    POST /api/reservations/recurring/
+    """
+    room_id = request.data.get('roomId') or request.data.get('room_id')
+    if not room_id:
+        return Response({"error": "Room ID is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        room = Room.objects.get(pk=room_id, is_active=True)
+    except Room.DoesNotExist:
+        return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    frequency = request.data.get('frequency')
+    start_date_str = request.data.get('startDate') or request.data.get('start_date')
+    end_date_str = request.data.get('endDate') or request.data.get('end_date')
+    start_time_str = request.data.get('startTime') or request.data.get('start_time')
+    end_time_str = request.data.get('endTime') or request.data.get('end_time')
+    purpose = request.data.get('purpose')
+    attendees = request.data.get('attendees', 1)
+    contact_email = request.data.get('contactEmail') or request.data.get('contact_email')
+    contact_phone = request.data.get('contactPhone') or request.data.get('contact_phone', '')
+
+    if not all([frequency, start_date_str, end_date_str, start_time_str, end_time_str, purpose, contact_email]):
+        return Response(
+            {"error": "Missing required fields: frequency, startDate, endDate, startTime, endTime, purpose, contactEmail"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if frequency not in dict(RecurringPattern.FREQUENCY_CHOICES):
+        return Response({"error": "Invalid frequency"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        start_date = date.fromisoformat(start_date_str)
+        end_date = date.fromisoformat(end_date_str)
+        start_time = time.fromisoformat(start_time_str)
+        end_time = time.fromisoformat(end_time_str)
+    except ValueError:
+        return Response(
+            {"error": "Invalid date/time format. Use YYYY-MM-DD and HH:MM"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if end_date < start_date:
+        return Response({"error": "endDate must not be before startDate"}, status=status.HTTP_400_BAD_REQUEST)
+
+    reservation_dates = _generate_occurrence_dates(frequency, start_date, end_date)
+
+    with transaction.atomic():
+        # Same room-level lock as the single-reservation create: the
+        # conflict sweep and the bulk insert must see a stable view, or a
+        # concurrent create could slip into one of the series' slots
+        room = Room.objects.select_for_update().get(pk=room.pk)
+
+        conflicting_dates = _conflicting_series_dates(room, reservation_dates, start_time, end_time)
+
+        to_create = [d for d in reservation_dates if d not in conflicting_dates]
+        if not to_create:
+            return Response(
+                {"error": "All dates in the series conflict with existing reservations"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        pattern = RecurringPattern.objects.create(
+            user=request.user,
+            room=room,
+            frequency=frequency,
+            start_date=start_date,
+            end_date=end_date,
+            start_time=start_time,
+            end_time=end_time,
+            purpose=purpose,
+            attendees=attendees,
+            contact_email=contact_email,
+            contact_phone=contact_phone
+        )
+
+        # Single multi-row INSERT for the whole series
+        Reservation.objects.bulk_create(
+            [
+                Reservation(
+                    user=request.user,
+                    room=room,
+                    date=d,
+                    # bulk_create bypasses save(), so populate the
+                    # denormalized column here
+                    start_datetime=timezone.make_aware(datetime.combine(d, start_time)),
+                    start_time=start_time,
+                    end_time=end_time,
+                    purpose=purpose,
+                    attendees=attendees,
+                    contact_email=contact_email,
+                    contact_phone=contact_phone,
+                    status='pending',
+                    recurring_pattern=pattern
+                )
+                for d in to_create
+            ],
+            ignore_conflicts=True,
+            batch_size=500
+        )
+
+        # With ignore_conflicts=True bulk_create returns instances
+        # without PKs (and the database may have skipped rows), so
+        # re-select what actually landed: the pattern FK identifies the
+        # series exactly, and these rows carry real PKs for the log FK
+        # and give an honest created_count
+        created = list(
+            Reservation.objects.filter(recurring_pattern=pattern)
+            .only('id', 'date').order_by('date')
+        )
+
+        # bulk_create skips the post_save signal, so the per-occurrence
+        # log rows are written here — in one multi-row INSERT rather than
+        # one create() per occurrence
+        ActivityLog.objects.bulk_create(
+            [
+                ActivityLog(
+                    user=request.user,
+                    action='reservation_created',
+                    room=room,
+                    reservation=res,
+                    description=f'Created reservation for {room.name} on {res.date} at {start_time}'
+                )
+                for res in created
+            ],
+            batch_size=500
+        )
+
+    return Response({
+        'pattern': RecurringPatternSerializer(pattern).data,
+        'created_count': len(created),
+        'skipped_dates': sorted(d.isoformat() for d in conflicting_dates),
+    }, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def preview_recurring_reservation(request):
+    """
+    Preview the dates a recurring reservation would cover, marking which
+    ones conflict with existing reservations. The UI calls this while the
+    user tweaks the series, so conflicts for the whole horizon are
+    resolved with one query via the shared helpers.
+    GET /api/reservations/recurring/preview/
+    """
+    params = request.query_params
+    room_id = params.get('roomId') or params.get('room_id')
+    frequency = params.get('frequency')
+    start_date_str = params.get('startDate') or params.get('start_date')
+    end_date_str = params.get('endDate') or params.get('end_date')
+    start_time_str = params.get('startTime') or params.get('start_time')
+    end_time_str = params.get('endTime') or params.get('end_time')
+
+    if not all([room_id, frequency, start_date_str, end_date_str, start_time_str, end_time_str]):
+        return Response(
+            {"error": "Required parameters: roomId, frequency, startDate, endDate, startTime, endTime"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if frequency not in dict(RecurringPattern.FREQUENCY_CHOICES):
+        return Response({"error": "Invalid frequency"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        room = Room.objects.only('id', 'name').get(pk=room_id, is_active=True)
+    except Room.DoesNotExist:
+        return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    try:
+        start_date = date.fromisoformat(start_date_str)
+        end_date = date.fromisoformat(end_date_str)
+        start_time = time.fromisoformat(start_time_str)
+        end_time = time.fromisoformat(end_time_str)
+    except ValueError:
+        return Response(
+            {"error": "Invalid date/time format. Use YYYY-MM-DD and HH:MM"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if end_date < start_date:
+        return Response({"error": "endDate must not be before startDate"}, status=status.HTTP_400_BAD_REQUEST)
+
+    reservation_dates = _generate_occurrence_dates(frequency, start_date, end_date)
+    conflict_set = _conflicting_series_dates(room, reservation_dates, start_time, end_time)
+
+    preview_dates = [
+        {
+            'date': d.isoformat(),
+            'day_of_week': WEEKDAYS[d.weekday()],
+            'has_conflict': d in conflict_set,
+        }
+        for d in reservation_dates
+    ]
+
+    return Response({
+        'room_id': room.id,
+        'room_name': room.name,
+        'frequency': frequency,
+        'total_dates': len(reservation_dates),
+        'conflict_count': len(conflict_set),
+        'preview_dates': preview_dates,
+    })
+
+
+# --- Check-in ---
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def check_in_reservation(request):
+    """
+    Check in to a confirmed reservation, recording how many attendees
+    actually showed up.
+    POST /api/reservations/checkin/
+    """
+    reservation_id = request.data.get('id')
+    actual_attendees = request.data.get('attendees') or request.data.get('actual_attendees')
+
+    if not reservation_id:
+        return Response({"error": "Reservation ID is required"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        reservation_id = int(reservation_id)
+    except (TypeError, ValueError):
+        return Response({"error": "Reservation ID must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        actual_attendees = int(actual_attendees)
+    except (TypeError, ValueError):
+        return Response({"error": "attendees must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+
+    now = timezone.now()
+    with transaction.atomic():
+        # The conditional UPDATE folds the "confirmed and today" guards
+        # into SQL: one statement instead of fetch, branch, full-row save
+        updated = Reservation.objects.filter(
+            pk=reservation_id,
+            status='confirmed',
+            date=now.date()
+        ).update(capacity_used=actual_attendees, updated_at=now)
+
+        if not updated:
+            return Response(
+                {"error": "No confirmed reservation for today with that ID"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # Queued and bulk-created at commit with any other rows from
+        # this transaction, outside the row lock held by the UPDATE
+        _queue_activity(
+            user=request.user,
+            action='reservation_checked_in',
+            reservation_id=reservation_id,
+            description=f'Checked in reservation {reservation_id} with {actual_attendees} attendees'
+        )
+
+    return Response({
+        'reservation_id': reservation_id,
+        'capacity_used': actual_attendees,
+        'message': 'Checked in successfully'
+    })
+
+
+# --- Reservation QR Code ---
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def generate_reservation_qr(request, reservation_id):
+    """
+    Generate a QR code encoding the reservation's check-in details.
+    GET /api/reservations/{id}/qr/
+    """
+    try:
+        # The QR payload only needs a handful of columns, so project just
+        # those instead of hydrating the full reservation, user and room rows
+        reservation = Reservation.objects.select_related('user', 'room').only(
+            'id', 'updated_at', 'date', 'start_time', 'end_time', 'purpose',
+            'status', 'user__username', 'room__id', 'room__name', 'room__building'
+        ).get(pk=reservation_id)
+    except Reservation.DoesNotExist:
+        return Response({"error": "Reservation not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    # The image only changes when the reservation does, so cache the
+    # encoded PNG keyed by (id, updated_at); repeat fetches skip the
+    # Reed-Solomon + PNG encoding entirely
+    cache_key = f'qr:{reservation.id}:{int(reservation.updated_at.timestamp())}'
+    img_str = cache.get(cache_key)
+    if img_str is None:
+        img_str = _encode_reservation_qr(reservation)
+        cache.set(cache_key, img_str, 60 * 60 * 24)
+
+    # Raw PNG bytes on request, sparing the ~33% base64 overhead.
+    # ?raw=1 rather than ?format=png: format is DRF's content-negotiation
+    # override and 404s before the handler runs
+    if request.query_params.get('raw'):
+        return HttpResponse(base64.b64decode(img_str), content_type='image/png')
+
+    return Response({
+        'reservation_id': reservation.id,
+        'qr_code': f'data:image/png;base64,{img_str}',
+    })
+
+
+def _encode_reservation_qr(reservation):
+    """Render the reservation's QR code and return it base64-encoded."""
+    qr_payload = json.dumps({
+        'reservation_id': reservation.id,
+        'room_id': reservation.room.id,
+        'room_name': reservation.room.name,
+        'building': reservation.room.building,
+        'date': reservation.date.isoformat(),
+        'start_time': reservation.start_time.strftime('%H:%M'),
+        'end_time': reservation.end_time.strftime('%H:%M'),
+        'user': reservation.user.username,
+        'status': reservation.status,
+    })
+
+    # PyPNGImage writes the PNG directly from the QR matrix; the default
+    # Pillow factory builds a full raster image object just to encode a
+    # two-color bitmap
+    qr = qrcode.QRCode(
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+        image_factory=PyPNGImage,
+    )
+    qr.add_data(qr_payload)
+    qr.make(fit=True)
+
+    buffer = io.BytesIO()
+    qr.make_image().save(buffer)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
 # --- Dashboard Statistics ---
+def _dashboard_response(request, stats, etag):
+    """Answer a dashboard poll, short-circuiting to 304 when the client's
+    If-None-Match still matches the cached stats window."""
+    if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(stats)
+    response['ETag'] = etag
+    response['Cache-Control'] = 'max-age=60'
+    return response
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def dashboard_stats(request):
@@ -434,80 +1020,91 @@ def dashboard_stats(request):
     - Today's reservations
     GET /api/stats/dashboard/
     """
-    # Try to get from cache first (cache for 5 minutes)
+    # Stale-while-revalidate, same pattern as room_status: entries
+    # fresher than 5 minutes are served directly; stale-but-present
+    # entries keep being served while the one request that wins the lock
+    # recomputes, so an expiry under load runs the aggregate once, not
+    # once per concurrent poll. The ETag is cached alongside the stats
+    # so repeat polls don't rehash
     cache_key = 'dashboard_stats'
-    cached_data = cache.get(cache_key)
-    if cached_data:
-        return Response(cached_data)
+    lock_key = 'dashboard_stats_lock'
+    cached = cache.get(cache_key)
+    if cached is not None:
+        age = pytime.time() - cached['computed_at']
+        if age < 300 or not cache.add(lock_key, '1', 30):
+            return _dashboard_response(request, cached['stats'], cached['etag'])
 
     now = timezone.now()
     today = now.date()
+    current_time = now.time()
+    next_week = today + timedelta(days=7)
 
-    # Total counts
     total_rooms = Room.objects.filter(is_active=True).count()
-    total_reservations = Reservation.objects.filter(status='confirmed').count()
-
-    # Today's reservations
-    today_reservations = Reservation.objects.filter(
-        date=today,
-        status__in=['pending', 'confirmed']
-    ).count()
-
-    # Calculate occupancy rate (rooms currently occupied vs total rooms)
-    current_time = now.time()
-    occupied_rooms = Reservation.objects.filter(
-        date=today,
-        start_time__lte=current_time,
-        end_time__gte=current_time,
-        status='confirmed'
-    ).values('room').distinct().count()
 
+    # One conditional aggregate covers every reservation-table count;
+    # each filter=Q(...) becomes a FILTER clause in the same scan
+    counts = Reservation.objects.aggregate(
+        total_reservations=Count('id', filter=Q(status='confirmed')),
+        today_reservations=Count(
+            'id', filter=Q(date=today, status__in=ACTIVE_STATUSES)
+        ),
+        occupied_rooms=Count(
+            'room',
+            filter=Q(
+                date=today,
+                start_time__lte=current_time,
+                end_time__gte=current_time,
+                status='confirmed'
+            ),
+            distinct=True
+        ),
+        avg_attendees=Avg('attendees', filter=Q(status='confirmed')),
+        upcoming_count=Count(
+            'id',
+            filter=Q(date__range=(today, next_week), status__in=ACTIVE_STATUSES)
+        ),
+    )
+
+    occupied_rooms = counts['occupied_rooms']
     occupancy_rate = (occupied_rooms / total_rooms * 100) if total_rooms > 0 else 0
 
-    # Popular rooms (by reservation count)
-    popular_rooms = Room.objects.filter(is_active=True).annotate(
-        reservation_count=Count('reservations', filter=Q(reservations__status='confirmed'))
-    ).order_by('-reservation_count')[:5]
-
-    popular_rooms_data = [
-        {
-            'id': room.id,
-            'name': room.name,
-            'building': room.building,
-            'reservation_count': room.reservation_count,
-            'capacity': room.capacity
-        }
-        for room in popular_rooms
-    ]
-
-    # Average attendees per reservation
-    avg_attendees = Reservation.objects.filter(
-        status='confirmed'
-    ).aggregate(avg=Avg('attendees'))['avg'] or 0
-
-    # Upcoming reservations (next 7 days)
-    next_week = today + timedelta(days=7)
-    upcoming_count = Reservation.objects.filter(
-        date__gte=today,
-        date__lte=next_week,
-        status__in=['pending', 'confirmed']
-    ).count()
+    # Popular rooms (by reservation count); a correlated subquery counts
+    # per room via the (room, status) index instead of LEFT JOINing the
+    # whole reservation history and grouping, and .values() returns the
+    # response dicts directly without hydrating Room instances
+    count_sq = Reservation.objects.filter(
+        room=OuterRef('pk'), status='confirmed'
+    ).order_by().values('room').annotate(c=Count('pk')).values('c')
+
+    popular_rooms_data = list(
+        Room.objects.filter(is_active=True).values(
+            'id', 'name', 'building', 'capacity'
+        ).annotate(
+            reservation_count=Coalesce(Subquery(count_sq), 0)
+        ).order_by('-reservation_count')[:5]
+    )
 
     stats = {
         'total_rooms': total_rooms,
-        'total_reservations': total_reservations,
-        'today_reservations': today_reservations,
+        'total_reservations': counts['total_reservations'],
+        'today_reservations': counts['today_reservations'],
         'occupancy_rate': round(occupancy_rate, 2),
         'occupied_rooms': occupied_rooms,
         'popular_rooms': popular_rooms_data,
-        'avg_attendees': round(avg_attendees, 2),
-        'upcoming_week_count': upcoming_count,
+        'avg_attendees': round(counts['avg_attendees'] or 0, 2),
+        'upcoming_week_count': counts['upcoming_count'],
         'timestamp': now.isoformat()
     }
 
-    # Cache for 5 minutes
-    cache.set(cache_key, stats, 300)
-    return Response(stats)
+    etag = '"%s"' % hashlib.md5(
+        json.dumps(stats, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+    # Kept for an hour so the stale-while-revalidate window outlives the
+    # 5-minute freshness TTL
+    cache.set(cache_key, {'stats': stats, 'etag': etag, 'computed_at': pytime.time()}, 3600)
+    cache.delete(lock_key)
+    return _dashboard_response(request, stats, etag)
 
 
 # --- Activity Feed ---
@@ -516,17 +1113,72 @@ def dashboard_stats(request):
 def activity_feed(request):
     """
     Get recent activity feed across all rooms.
-    GET /api/activity/feed/?limit=20
+    Supports keyset paging: pass the returned next_before cursor to fetch
+    the following page without re-scanning newer rows.
+    GET /api/activity/feed/?limit=20&before=<iso-timestamp>
     """
     limit = int(request.query_params.get('limit', 20))
     limit = min(limit, 100)  # Max 100 items
 
-    activities = ActivityLog.objects.select_related('user', 'room').order_by('-created_at')[:limit]
-    serializer = ActivityLogSerializer(activities, many=True)
+    # values() skips model and serializer construction entirely: the
+    # feed only re-shapes a handful of scalar columns, so hydrating
+    # ActivityLog/User/Room instances per row is pure overhead
+    feed = ActivityLog.objects.values(
+        'id', 'action', 'description', 'created_at',
+        'user__id', 'user__username', 'user__email', 'room__name'
+    )
+
+    # Keyset cursor on (created_at, id): each page is an index range
+    # scan from the cursor down, so deep pages cost the same as the
+    # first one (OFFSET would walk and discard all newer rows). The id
+    # tiebreak keeps rows sharing a timestamp from being skipped at a
+    # page boundary; a bare timestamp cursor is still accepted
+    before = request.query_params.get('before')
+    if before:
+        ts, _, tie_id = before.partition(',')
+        try:
+            before_dt = datetime.fromisoformat(ts)
+            before_id = int(tie_id) if tie_id else None
+        except ValueError:
+            return Response(
+                {"error": "Invalid before cursor. Use an ISO timestamp, optionally followed by ,<id>"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if before_id is not None:
+            feed = feed.filter(
+                Q(created_at__lt=before_dt) |
+                Q(created_at=before_dt, id__lt=before_id)
+            )
+        else:
+            feed = feed.filter(created_at__lt=before_dt)
+
+    rows = list(feed.order_by('-created_at', '-id')[:limit])
+    # One clock read for the whole page; time_ago is computed against it
+    now = timezone.now()
+    activities = [
+        {
+            'id': row['id'],
+            'user': {
+                'id': row['user__id'],
+                'username': row['user__username'],
+                'email': row['user__email'],
+            },
+            'action': row['action'],
+            'room_name': row['room__name'],
+            'description': row['description'],
+            'created_at': row['created_at'],
+            'time_ago': format_time_ago(now - row['created_at']),
+        }
+        for row in rows
+    ]
 
     return Response({
-        'count': activities.count(),
-        'activities': serializer.data
+        'count': len(activities),
+        'activities': activities,
+        'next_before': (
+            f"{rows[-1]['created_at'].isoformat()},{rows[-1]['id']}"
+            if len(rows) == limit else None
+        )
     })
 
 
@@ -539,25 +1191,29 @@ def user_profile(request):
     GET /api/profile/
     PATCH /api/profile/
     """
-    profile, created = UserProfile.objects.get_or_create(user=request.user)
+    profile = _get_profile(request.user)
 
     if request.method == 'GET':
         serializer = UserProfileSerializer(profile)
         return Response(serializer.data)
 
     elif request.method == 'PATCH':
-        # Update profile fields
+        # Update profile fields: only the columns the request actually
+        # provided are written, and a no-op PATCH skips the UPDATE
+        # entirely
+        changes = {}
         theme = request.data.get('theme')
-        notifications_enabled = request.data.get('notifications_enabled')
-        email_reminders = request.data.get('email_reminders')
-
         if theme:
-            profile.theme = theme
-        if notifications_enabled is not None:
-            profile.notifications_enabled = notifications_enabled
-        if email_reminders is not None:
-            profile.email_reminders = email_reminders
+            changes['theme'] = theme
+        if 'notifications_enabled' in request.data:
+            changes['notifications_enabled'] = request.data['notifications_enabled']
+        if 'email_reminders' in request.data:
+            changes['email_reminders'] = request.data['email_reminders']
+
+        if changes:
+            for field, value in changes.items():
+                setattr(profile, field, value)
+            profile.save(update_fields=[*changes, 'updated_at'])
 
-        profile.save()
         serializer = UserProfileSerializer(profile)
         return Response(serializer.data)
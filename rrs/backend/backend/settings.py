@@ -97,6 +97,12 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ),
+    # orjson-backed renderer (falls back to the stock one when orjson is
+    # not installed); encoding the final dict tree is the remaining hot
+    # path on large list responses
+    "DEFAULT_RENDERER_CLASSES": (
+        "api.renderers.ORJSONRenderer",
+    ),
 }
 
 SIMPLE_JWT = {
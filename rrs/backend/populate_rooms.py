@@ -79,20 +79,27 @@ def populate_rooms():
         },
     ]
 
-    created_count = 0
+    # One SELECT for the existing (name, building) pairs and one
+    # multi-row INSERT for the missing rooms, instead of a SELECT +
+    # INSERT round-trip per sample room
+    existing = set(
+        Room.objects.filter(
+            name__in=[room_data["name"] for room_data in sample_rooms]
+        ).values_list("name", "building")
+    )
+
+    to_create = []
     for room_data in sample_rooms:
-        room, created = Room.objects.get_or_create(
-            name=room_data["name"],
-            building=room_data["building"],
-            defaults=room_data
-        )
-        if created:
-            created_count += 1
-            print(f"✓ Created: {room.name} in {room.building}")
+        if (room_data["name"], room_data["building"]) in existing:
+            print(f"- Already exists: {room_data['name']} in {room_data['building']}")
         else:
-            print(f"- Already exists: {room.name} in {room.building}")
+            to_create.append(Room(**room_data))
+
+    Room.objects.bulk_create(to_create, ignore_conflicts=True)
+    for room in to_create:
+        print(f"✓ Created: {room.name} in {room.building}")
 
-    print(f"\n{created_count} rooms created successfully!")
+    print(f"\n{len(to_create)} rooms created successfully!")
     print(f"Total rooms in database: {Room.objects.count()}")
 
 if __name__ == "__main__":
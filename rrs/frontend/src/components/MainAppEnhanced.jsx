@@ -132,13 +132,19 @@ const MainAppEnhanced = ({ user, setUser }) => {
       onMessage: (data) => {
         console.log('[MainApp] WebSocket message:', data);
 
-        // Handle heartbeat with all room statuses
-        if (data.type === 'heartbeat' && data.rooms) {
-          const statusMap = {};
-          data.rooms.forEach(status => {
-            statusMap[status.room_id] = status;
+        // Handle heartbeat deltas: only rooms whose status changed since
+        // the last frame are included, plus ids of removed rooms
+        if (data.type === 'heartbeat.delta') {
+          setRoomStatuses(prev => {
+            const next = { ...prev };
+            (data.changed || []).forEach(status => {
+              next[status.room_id] = status;
+            });
+            (data.removed || []).forEach(roomId => {
+              delete next[roomId];
+            });
+            return next;
           });
-          setRoomStatuses(statusMap);
         }
 
         // Handle initial rooms status
@@ -175,8 +181,13 @@ const MainAppEnhanced = ({ user, setUser }) => {
             }
           }
 
-          // Refresh room statuses
-          fetchRoomStatuses();
+          // Apply the refreshed status pushed with the event; fall back
+          // to a full refetch if it's missing
+          if (data.room_status) {
+            setRoomStatuses(prev => ({ ...prev, [room_id]: data.room_status }));
+          } else {
+            fetchRoomStatuses();
+          }
 
           // If it's user's reservation, refresh their reservation list
           if (reservation && reservation.user && reservation.user.id === user.id) {
@@ -65,13 +65,19 @@ const RoomMonitor = () => {
       onMessage: (data) => {
         console.log('[RoomMonitor] WebSocket message:', data);
 
-        // Handle heartbeat updates with all room statuses
-        if (data.type === 'heartbeat' && data.rooms) {
-          const statusMap = {};
-          data.rooms.forEach(status => {
-            statusMap[status.room_id] = status;
+        // Handle heartbeat deltas: only rooms whose status changed since
+        // the last frame are included, plus ids of removed rooms
+        if (data.type === 'heartbeat.delta') {
+          setRoomStatuses(prev => {
+            const next = { ...prev };
+            (data.changed || []).forEach(status => {
+              next[status.room_id] = status;
+            });
+            (data.removed || []).forEach(roomId => {
+              delete next[roomId];
+            });
+            return next;
           });
-          setRoomStatuses(statusMap);
         }
 
         // Handle initial rooms status
@@ -83,17 +89,18 @@ const RoomMonitor = () => {
           setRoomStatuses(statusMap);
         }
 
-        // Handle individual room updates
+        // Handle individual room updates: the event carries the room's
+        // refreshed status, so apply it directly instead of waiting for
+        // a heartbeat to reconcile
         if (data.type === 'room.update' && data.room_id) {
-          // Refresh specific room status
-          setRoomStatuses(prev => ({
-            ...prev,
-            [data.room_id]: {
-              ...prev[data.room_id],
-              // Trigger a status refresh on next heartbeat
-              needsRefresh: true
-            }
-          }));
+          if (data.room_status) {
+            setRoomStatuses(prev => ({
+              ...prev,
+              [data.room_id]: data.room_status
+            }));
+          } else {
+            fetchRoomStatuses();
+          }
         }
       }
     }